@@ -2,6 +2,9 @@
 
 __all__ = [
     "bot",
+    "cache",
+    "ratelimit",
+    "updates",
     "database",
     "localization",
     "keyboards",
@@ -4,14 +4,19 @@ from __future__ import annotations
 import asyncio
 import csv
 import logging
+import queue
 import re
 import signal
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from functools import lru_cache
 from html import escape
-from io import BytesIO, StringIO
-from typing import Any, Iterable, Optional, Sequence, Tuple
+from io import BytesIO, TextIOWrapper
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence, Tuple
 
-from telegram import InlineKeyboardMarkup, InputFile, Update, constants
+from telegram import CallbackQuery, InlineKeyboardMarkup, InputFile, Update, constants
 from telegram.error import TelegramError
 from telegram.ext import (
     AIORateLimiter,
@@ -35,6 +40,7 @@ from .database import (
     PersonUsageStats,
     PersonAlreadyExistsError,
     SearchResponse,
+    Transaction,
 )
 from .keyboards import (
     back_to_main_menu_keyboard,
@@ -64,35 +70,99 @@ from .keyboards import (
     confirm_delete_person_keyboard,
     skip_keyboard,
 )
-from .localization import available_languages, get_text
+from .localization import available_languages, get_text, preload_texts
+from .ratelimit import ChatRateLimiter
+from .updates import ChatUpdateProcessor
+
+# The language table is fixed at import time; a read-only view guards it.
+_LANGUAGES = MappingProxyType(available_languages())
 
 # Patched ConversationHandler support for per-message tracking with message updates
 _WORKFLOW_PROMPT_KEY = "_workflow_prompt_key"
 _WORKFLOW_PROMPT_MESSAGE_IDS: dict[Tuple[int, ...], int] = {}
-_AMOUNT_PATTERN = re.compile(r"^\d+$")
+_LANGUAGE_KEYBOARD_OPEN_KEY = "_language_keyboard_open"
+_WORKFLOW_ACTIVE_KEY = "_workflow_active"
+_AMOUNT_PATTERN = re.compile(r"\s*(\d+)\s*")
+_DATE_RANGE_PATTERN = re.compile(r"\s*([^,]+?)\s*,\s*(.+?)\s*")
+_PERSON_REFERENCE_PATTERN = re.compile(r"\s*#?(\d+)\s*")
+_ID_CALLBACK_PATTERN = re.compile(r"[a-z_]+:(\d+)")
 
 
 def _parse_positive_amount(text: str) -> Optional[int]:
     """Parse and validate a user-provided positive integer amount."""
 
-    cleaned = text.strip()
-    if not cleaned or not _AMOUNT_PATTERN.fullmatch(cleaned):
-        return None
-    try:
-        value = int(cleaned)
-    except ValueError:
+    match = _AMOUNT_PATTERN.fullmatch(text)
+    if match is None:
         return None
+    value = int(match.group(1))
     if value <= 0:
         return None
     return value
 
 
+def _parse_person_reference(text: str) -> Optional[int]:
+    """Parse a ``#ID`` or bare numeric contact reference."""
+
+    # Bare IDs are the common case. ``isdecimal`` accepts exactly the digits
+    # ``\d`` and ``int`` do, unlike ``isdigit`` (which also passes "²").
+    if text.isdecimal():
+        return int(text)
+    match = _PERSON_REFERENCE_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    return int(match.group(1))
+
+
+def _parse_callback_id(data: str) -> Optional[int]:
+    """Return the numeric id from ``prefix:ID`` callback data, if well formed."""
+
+    match = _ID_CALLBACK_PATTERN.fullmatch(data)
+    if match is None:
+        return None
+    return int(match.group(1))
+
+
+def _parse_date_range(text: str) -> Optional[Tuple[datetime, datetime]]:
+    """Parse a ``START, END`` pair of ISO dates, returning ``None`` when invalid."""
+
+    match = _DATE_RANGE_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    try:
+        return (
+            datetime.fromisoformat(match.group(1)),
+            datetime.fromisoformat(match.group(2)),
+        )
+    except ValueError:
+        return None
+
+
 def _format_integer(value: int) -> str:
     """Format an integer with digit grouping separators."""
 
     return f"{value:,}"
 
 
+# Contact names and descriptions repeat across history rows and renders, so
+# their escaped forms are memoized rather than recomputed per line.
+_escape_html = lru_cache(maxsize=4096)(escape)
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(value: datetime) -> str:
+    """Format a transaction timestamp to the minute.
+
+    The same recent transactions appear on every dashboard and history render,
+    so formatted values are memoized. Misses format the fields directly, which
+    is about twice as fast as going through ``strftime``.
+    """
+
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+        f"{value.hour:02d}:{value.minute:02d}"
+    )
+
+
 def _format_amount(amount: int) -> str:
     """Format an integer amount for display without cents."""
 
@@ -196,15 +266,27 @@ def _drop_prompt_message(context: ContextTypes.DEFAULT_TYPE) -> None:
         _WORKFLOW_PROMPT_MESSAGE_IDS.pop(base_key, None)
 
 
-def _reset_person_menu_context(context: ContextTypes.DEFAULT_TYPE) -> None:
-    for key in (
+_PERSON_MENU_KEYS = frozenset(
+    {
         "person_menu_page",
+        "person_menu_message_id",
         "person_menu_results",
         "person_menu_mode",
         "person_menu_search_query",
         "person_menu_search_expected",
-    ):
-        context.user_data.pop(key, None)
+    }
+)
+
+
+def _discard_keys(user_data: dict[str, Any], keys: frozenset[str]) -> None:
+    """Delete whichever of ``keys`` are present, in one pass over ``user_data``."""
+
+    for key in keys.intersection(user_data):
+        del user_data[key]
+
+
+def _reset_person_menu_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+    _discard_keys(context.user_data, _PERSON_MENU_KEYS)
 
 
 class _CallbackHandlerWrapper(CallbackQueryHandler):
@@ -239,47 +321,81 @@ class _CallbackHandlerWrapper(CallbackQueryHandler):
         return getattr(self._inner, item)
 
 
-def _wrap_handlers(handlers: Iterable[BaseHandler[Update, ContextTypes.DEFAULT_TYPE]]):
-    wrapped = []
-    for handler in handlers:
-        if isinstance(handler, CallbackQueryHandler):
-            wrapped.append(handler)
-        elif isinstance(handler, _CallbackHandlerWrapper):
-            wrapped.append(handler)
-        else:
-            wrapped.append(_CallbackHandlerWrapper(handler))
-    return wrapped
-
-
-# Conversation states
-ADD_PERSON_NAME = 1
-DEBT_ENTRY = 10
-DEBT_AMOUNT = 11
-DEBT_DESCRIPTION = 12
-PAYMENT_ENTRY = 20
-PAYMENT_AMOUNT = 21
-PAYMENT_DESCRIPTION = 22
-HISTORY_PERSON, HISTORY_DATES = range(30, 32)
-SEARCH_QUERY = 40
-LANGUAGE_SELECTION = 50
-EXPORT_MODE, EXPORT_CONTACT_CHOICE, EXPORT_PERSON = range(60, 63)
+def _wrap_handlers(
+    handlers: Iterable[BaseHandler[Update, ContextTypes.DEFAULT_TYPE]],
+) -> Tuple[BaseHandler[Update, ContextTypes.DEFAULT_TYPE], ...]:
+    return tuple(
+        handler
+        if isinstance(handler, CallbackQueryHandler)
+        else _CallbackHandlerWrapper(handler)
+        for handler in handlers
+    )
+
+
+class State(IntEnum):
+    """Conversation states shared by the workflow handlers."""
+
+    ADD_PERSON_NAME = 1
+    DEBT_ENTRY = 10
+    DEBT_AMOUNT = 11
+    DEBT_DESCRIPTION = 12
+    PAYMENT_ENTRY = 20
+    PAYMENT_AMOUNT = 21
+    PAYMENT_DESCRIPTION = 22
+    HISTORY_PERSON = 30
+    HISTORY_DATES = 31
+    SEARCH_QUERY = 40
+    LANGUAGE_SELECTION = 50
+    EXPORT_MODE = 60
+    EXPORT_CONTACT_CHOICE = 61
+    EXPORT_PERSON = 62
+    MANAGE_PERSON_SELECT = 70
+    MANAGE_PERSON_ACTION = 71
+    MANAGE_PERSON_RENAME = 72
+    MANAGE_PERSON_CONFIRM_DELETE = 73
+    MANAGE_DESCRIPTION_SELECT = 80
+    MANAGE_DESCRIPTION_CHOOSE = 81
+    MANAGE_DESCRIPTION_EDIT = 82
+    MANAGE_DESCRIPTION_CONFIRM_DELETE = 83
+
+
+# Module-level aliases used throughout the handlers, in definition order.
 (
+    ADD_PERSON_NAME,
+    DEBT_ENTRY,
+    DEBT_AMOUNT,
+    DEBT_DESCRIPTION,
+    PAYMENT_ENTRY,
+    PAYMENT_AMOUNT,
+    PAYMENT_DESCRIPTION,
+    HISTORY_PERSON,
+    HISTORY_DATES,
+    SEARCH_QUERY,
+    LANGUAGE_SELECTION,
+    EXPORT_MODE,
+    EXPORT_CONTACT_CHOICE,
+    EXPORT_PERSON,
     MANAGE_PERSON_SELECT,
     MANAGE_PERSON_ACTION,
     MANAGE_PERSON_RENAME,
     MANAGE_PERSON_CONFIRM_DELETE,
-) = range(70, 74)
-
-(
     MANAGE_DESCRIPTION_SELECT,
     MANAGE_DESCRIPTION_CHOOSE,
     MANAGE_DESCRIPTION_EDIT,
     MANAGE_DESCRIPTION_CONFIRM_DELETE,
-) = range(80, 84)
+) = State
+
+# Flow name -> (amount prompt key, state) for menu-driven debt/payment entry.
+_MENU_AMOUNT_PROMPTS: dict[str, Tuple[str, State]] = {
+    "debt": ("enter_debt_amount", State.DEBT_AMOUNT),
+    "payment": ("enter_payment_amount", State.PAYMENT_AMOUNT),
+}
 
 LOGGER = logging.getLogger(__name__)
 
 PERSON_MENU_PAGE_SIZE = 5
+# Matches shown for a free-text search; the database ranks no more than this.
+SEARCH_RESULTS_LIMIT = 5
 
 MAIN_MENU_ACTIONS = (
     "add_person",
@@ -295,20 +411,64 @@ MAIN_MENU_ACTIONS = (
 )
 
 MENU_CALLBACK_FALLBACK_PATTERN = re.compile(
-    rf"^menu:(?!(?:{'|'.join(MAIN_MENU_ACTIONS)})$).+$"
+    rf"^menu:(?!(?:{'|'.join(MAIN_MENU_ACTIONS)})$).", re.ASCII
 )
 
+# Casefolded language code or label -> language code, for typed selections.
+_LANGUAGE_LOOKUP: dict[str, str] = {}
+for _code, _label in _LANGUAGES.items():
+    _LANGUAGE_LOOKUP.setdefault(_code.casefold(), _code)
+    _LANGUAGE_LOOKUP.setdefault(_label.casefold(), _code)
+del _code, _label
+# Case folding never shortens these inputs, so longer text cannot match a key.
+_LANGUAGE_LOOKUP_MAX_LENGTH = max(map(len, _LANGUAGE_LOOKUP))
+
+# Exact callback data emitted by ``language_keyboard`` -> language code.
+_LANGUAGE_CALLBACKS = {f"lang:{code}": code for code in _LANGUAGES}
+
+_HISTORY_RANGE_SUMMARY_TEMPLATES = {
+    code: get_text("history_custom_range_summary", code)
+    for code in _LANGUAGES
+}
+
+
+def _escape_format(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+# Dashboard heading and totals block, with only the amounts left to fill in.
+_DASHBOARD_TOTALS_TEMPLATES = {
+    code: "\n".join(
+        [
+            _escape_format(get_text("dashboard_summary", code)),
+            f"{_escape_format(get_text('total_debt', code))}: {{total_debt}}",
+            f"{_escape_format(get_text('total_payments', code))}: {{total_payments}}",
+            f"{_escape_format(get_text('outstanding_balance', code))}: {{outstanding}}",
+        ]
+    )
+    for code in _LANGUAGES
+}
+
+
+DB_KEY = "db"
+
 
 async def get_language(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> str:
     language = context.user_data.get("language")
     if language:
         return language
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     language = await db.get_user_language(user_id)
     context.user_data["language"] = language
     return language
 
 
+def _get_db(context: ContextTypes.DEFAULT_TYPE) -> Database:
+    """Return the application's :class:`Database`, stored in ``bot_data`` by main()."""
+
+    return context.bot_data[DB_KEY]
+
+
 def get_reply_target(update: Update):
     if update.message:
         return update.message
@@ -322,6 +482,29 @@ async def answer_callback(update: Update) -> None:
         await update.callback_query.answer()
 
 
+def answer_callback_soon(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Acknowledge the callback query without waiting for Telegram's response.
+
+    The answer carries no information the handler needs, so its round-trip
+    can overlap with the reply that follows. Failures are still reported by
+    PTB.
+    """
+
+    if update.callback_query:
+        context.application.create_task(update.callback_query.answer(), update=update)
+
+
+async def _answer_and_clear_markup(query: CallbackQuery) -> None:
+    """Answer ``query`` and remove its inline keyboard concurrently."""
+
+    if query.message:
+        await asyncio.gather(
+            query.answer(), query.message.edit_reply_markup(reply_markup=None)
+        )
+    else:
+        await query.answer()
+
+
 async def _send_menu_prompt(
     update: Update, prompt: str, reply_markup: InlineKeyboardMarkup
 ) -> None:
@@ -346,7 +529,14 @@ async def _send_menu_prompt(
     await target.reply_text(prompt, reply_markup=reply_markup)
 
 
+@lru_cache(maxsize=4096)
 def format_balance_status(balance: int, language: str) -> str:
+    """Describe ``balance`` as owed, owing or settled.
+
+    Memoized because search results repeat the same few balances, most often
+    zero.
+    """
+
     if balance > 0:
         return get_text("balance_debtor", language).format(
             amount=_format_amount(balance)
@@ -360,12 +550,13 @@ def format_balance_status(balance: int, language: str) -> str:
 
 def format_search_results(language: str, response: SearchResponse) -> str:
     lines = [get_text("search_results", language)]
-    for index, match in enumerate(response.matches[:5], start=1):
+    item_template = get_text("search_result_item", language)
+    for index, match in enumerate(response.matches[:SEARCH_RESULTS_LIMIT], start=1):
         person = match.person
         score_percent = int(round(min(max(match.score, 0.0), 1.0) * 100))
         status = format_balance_status(match.balance, language)
         lines.append(
-            get_text("search_result_item", language).format(
+            item_template.format(
                 index=index,
                 name=person.name,
                 id=person.id,
@@ -382,43 +573,43 @@ def format_search_results(language: str, response: SearchResponse) -> str:
 
 
 def format_dashboard(summary: DashboardSummary, language: str) -> str:
-    lines = [get_text("dashboard_summary", language)]
     totals = summary.totals
-    lines.extend(
-        [
-            f"{get_text('total_debt', language)}: {_format_amount(totals.total_debt)}",
-            f"{get_text('total_payments', language)}: {_format_amount(totals.total_payments)}",
-            f"{get_text('outstanding_balance', language)}: {_format_amount(totals.outstanding_balance)}",
-        ]
+    template = _DASHBOARD_TOTALS_TEMPLATES.get(
+        language, _DASHBOARD_TOTALS_TEMPLATES["en"]
     )
+    lines = [
+        template.format(
+            total_debt=_format_amount(totals.total_debt),
+            total_payments=_format_amount(totals.total_payments),
+            outstanding=_format_amount(totals.outstanding_balance),
+        )
+    ]
 
     if summary.top_debtors:
         lines.append(get_text("top_debtors", language))
-        for index, debtor in enumerate(summary.top_debtors, start=1):
-            person = debtor.person
-            lines.append(
-                f"{index}. {person.name} (#{person.id}) — {_format_amount(debtor.balance)}"
-            )
+        lines.extend(
+            f"{index}. {debtor.person.name} (#{debtor.person.id}) — "
+            f"{_format_amount(debtor.balance)}"
+            for index, debtor in enumerate(summary.top_debtors, start=1)
+        )
     else:
         lines.append(get_text("no_debtors", language))
 
     if summary.recent_transactions:
         lines.append(get_text("recent_transactions", language))
-        for activity in summary.recent_transactions:
-            transaction = activity.transaction
-            template = (
-                "recent_transaction_debt"
-                if transaction.amount > 0
-                else "recent_transaction_payment"
-            )
-            lines.append(
-                get_text(template, language).format(
-                    name=activity.person_name,
-                    amount=_format_amount(abs(transaction.amount)),
-                    date=transaction.created_at.strftime("%Y-%m-%d %H:%M"),
-                    description=transaction.description or "-",
-                )
+        debt_template = get_text("recent_transaction_debt", language)
+        payment_template = get_text("recent_transaction_payment", language)
+        lines.extend(
+            (
+                debt_template if activity.transaction.amount > 0 else payment_template
+            ).format(
+                name=activity.person_name,
+                amount=_format_amount(abs(activity.transaction.amount)),
+                date=_format_timestamp(activity.transaction.created_at),
+                description=activity.transaction.description or "-",
             )
+            for activity in summary.recent_transactions
+        )
     else:
         lines.append(get_text("no_transactions", language))
 
@@ -434,6 +625,13 @@ def with_cancel_hint(message: str, language: str) -> str:
     return f"{message}\n\n{cancel_hint}"
 
 
+@lru_cache(maxsize=256)
+def _cancel_prompt(key: str, language: str) -> str:
+    """Return the static text ``key`` with the cancel hint appended."""
+
+    return with_cancel_hint(get_text(key, language), language)
+
+
 async def show_management_menu(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -482,7 +680,7 @@ async def handle_database_backup(
     query = update.callback_query
     if query:
         await query.answer()
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     try:
         backup_path = await db.create_backup_now()
     except Exception:
@@ -512,7 +710,7 @@ async def handle_database_zip(
     query = update.callback_query
     if query:
         await query.answer()
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     try:
         archive_path = await db.zip_all_databases()
     except Exception:
@@ -535,19 +733,46 @@ async def handle_database_zip(
     LOGGER.info("Database archive delivered: %s", archive_path)
 
 
+PEOPLE_LIST_MESSAGE_LIMIT = 3500
+
+
+def _chunk_lines(lines: Iterable[str], max_length: int) -> list[str]:
+    """Join ``lines`` with newlines into messages no longer than ``max_length``.
+
+    A single line longer than ``max_length`` is kept whole in its own chunk.
+    """
+
+    chunks: list[str] = []
+    buffer: list[str] = []
+    size = 0
+    for line in lines:
+        added = len(line) + 1 if buffer else len(line)
+        if buffer and size + added > max_length:
+            chunks.append("\n".join(buffer))
+            buffer = [line]
+            size = len(line)
+        else:
+            buffer.append(line)
+            size += added
+    if buffer:
+        chunks.append("\n".join(buffer))
+    return chunks
+
+
 async def show_people_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # Cleared up front for the same reason as in show_dashboard.
+    clear_workflow(context)
     language = await get_language(context, update.effective_user.id)
     if update.callback_query:
         await update.callback_query.answer()
     target = get_reply_target(update)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     people = await db.list_people()
     if not people:
         await target.reply_text(
             get_text("no_people", language),
             reply_markup=back_to_main_menu_keyboard(language),
         )
-        clear_workflow(context)
         return
 
     header = get_text("people_list_header", language).format(
@@ -556,80 +781,70 @@ async def show_people_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     lines = [header]
     lines.extend(f"• {person.name} (#{person.id})" for person in people)
 
-    max_length = 3500
-    chunk = ""
-    for line in lines:
-        candidate = f"{chunk}\n{line}" if chunk else line
-        if len(candidate) > max_length and chunk:
-            await target.reply_text(chunk)
-            chunk = line
-        else:
-            chunk = candidate
-
-    if chunk:
-        await target.reply_text(
-            chunk,
-            reply_markup=back_to_main_menu_keyboard(language),
-        )
-
-    clear_workflow(context)
+    *leading, last = _chunk_lines(lines, PEOPLE_LIST_MESSAGE_LIMIT)
+    for chunk in leading:
+        await target.reply_text(chunk)
+    await target.reply_text(
+        last,
+        reply_markup=back_to_main_menu_keyboard(language),
+    )
 
 
-async def _start_manage_person_flow(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE,
-    *,
-    mode: Optional[str] = None,
-) -> int:
+def _begin_manage_person_flow(
+    context: ContextTypes.DEFAULT_TYPE, *, mode: Optional[str] = None
+) -> None:
     clear_workflow(context)
     context.user_data.pop("manage_mode", None)
     if mode:
         context.user_data["manage_mode"] = mode
-    context.user_data["flow"] = "manage_person"
+    _begin_workflow(context, "manage_person")
     context.user_data["person_state"] = MANAGE_PERSON_SELECT
-    return await prompt_person_selection(update, context)
 
 
 async def start_manage_person(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    return await _start_manage_person_flow(update, context)
+    _begin_manage_person_flow(context)
+    return await prompt_person_selection(update, context)
 
 
 async def start_contact_edit(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    return await _start_manage_person_flow(update, context, mode="edit")
+    _begin_manage_person_flow(context, mode="edit")
+    return await prompt_person_selection(update, context)
 
 
 async def start_contact_delete(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    return await _start_manage_person_flow(update, context, mode="delete")
+    _begin_manage_person_flow(context, mode="delete")
+    return await prompt_person_selection(update, context)
 
 
-async def _start_manage_description_flow(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, *, mode: str
-) -> int:
+def _begin_manage_description_flow(
+    context: ContextTypes.DEFAULT_TYPE, *, mode: str
+) -> None:
     clear_workflow(context)
-    context.user_data["flow"] = "manage_description"
+    _begin_workflow(context, "manage_description")
     context.user_data["description_mode"] = mode
     context.user_data["person_state"] = MANAGE_DESCRIPTION_SELECT
     context.user_data.pop("person_descriptions", None)
     context.user_data.pop("selected_description", None)
-    return await prompt_person_selection(update, context)
 
 
 async def start_description_edit(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    return await _start_manage_description_flow(update, context, mode="edit")
+    _begin_manage_description_flow(context, mode="edit")
+    return await prompt_person_selection(update, context)
 
 
 async def start_description_delete(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    return await _start_manage_description_flow(update, context, mode="delete")
+    _begin_manage_description_flow(context, mode="delete")
+    return await prompt_person_selection(update, context)
 
 
 async def prompt_manage_person_action(
@@ -638,7 +853,7 @@ async def prompt_manage_person_action(
     language: str,
     person: Person,
 ) -> int:
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     balance = await db.get_balance(person.id)
     status = format_balance_status(balance, language)
     message = with_cancel_hint(
@@ -697,36 +912,40 @@ async def prompt_manage_person_action(
 async def handle_manage_person_action(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
+    user_data = context.user_data
     query = update.callback_query
     if not query or not query.data:
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
     parts = query.data.split(":", 2)
     if len(parts) != 3:
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     action, raw_id = parts[1], parts[2]
     if not raw_id.isdigit():
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     person_id = int(raw_id)
-    db: Database = context.bot_data["db"]
-    person = await db.get_person(person_id)
-    if not person:
-        await query.answer(get_text("not_found", language), show_alert=True)
-        clear_workflow(context)
-        if query.message:
-            await query.message.edit_text(get_text("not_found", language))
-        await send_main_menu_reply(update, context, language)
-        return ConversationHandler.END
+    db = _get_db(context)
+    # The overview that offered these buttons already stored the person.
+    person: Optional[Person] = user_data.get("person")
+    if person is None or person.id != person_id:
+        person = await db.get_person(person_id)
+        if not person:
+            await query.answer(get_text("not_found", language), show_alert=True)
+            clear_workflow(context)
+            if query.message:
+                await query.message.edit_text(get_text("not_found", language))
+            await send_main_menu_reply(update, context, language)
+            return ConversationHandler.END
 
-    context.user_data["person"] = person
+        user_data["person"] = person
 
     if action == "rename":
-        context.user_data["person_state"] = MANAGE_PERSON_RENAME
+        user_data["person_state"] = MANAGE_PERSON_RENAME
         prompt = with_cancel_hint(
             get_text("rename_person_prompt", language).format(
                 name=person.name, id=person.id
@@ -741,7 +960,7 @@ async def handle_manage_person_action(
         return MANAGE_PERSON_RENAME
 
     if action == "delete":
-        context.user_data["person_state"] = MANAGE_PERSON_CONFIRM_DELETE
+        user_data["person_state"] = MANAGE_PERSON_CONFIRM_DELETE
         message = with_cancel_hint(
             get_text("delete_person_confirm", language).format(
                 name=person.name, id=person.id
@@ -773,7 +992,7 @@ async def handle_manage_person_action(
         return await prompt_manage_person_action(update, context, language, person)
 
     await query.answer()
-    return context.user_data.get("person_state", ConversationHandler.END)
+    return user_data.get("person_state", ConversationHandler.END)
 
 
 async def receive_person_rename(
@@ -782,12 +1001,13 @@ async def receive_person_rename(
     language = await get_language(context, update.effective_user.id)
     person: Optional[Person] = context.user_data.get("person")
     if not person:
-        await update.message.reply_text(get_text("not_found", language))
         clear_workflow(context)
-        await send_main_menu_reply(update, context, language)
+        await send_main_menu_reply(
+            update, context, language, notice=get_text("not_found", language)
+        )
         return ConversationHandler.END
 
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     new_name = update.message.text.strip()
     try:
         updated = await db.rename_person(person.id, new_name)
@@ -800,32 +1020,25 @@ async def receive_person_rename(
         )
         return MANAGE_PERSON_RENAME
     except ValueError:
-        await update.message.reply_text(get_text("not_found", language))
         clear_workflow(context)
-        await send_main_menu_reply(update, context, language)
+        await send_main_menu_reply(
+            update, context, language, notice=get_text("not_found", language)
+        )
         return ConversationHandler.END
 
     context.user_data["person"] = updated
-    await update.message.reply_text(
-        get_text("rename_person_success", language).format(
+    clear_workflow(context)
+    await send_main_menu_reply(
+        update,
+        context,
+        language,
+        notice=get_text("rename_person_success", language).format(
             name=updated.name, id=updated.id
-        )
+        ),
     )
-    clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
     return ConversationHandler.END
 
 
-async def prompt_manage_description_action(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE,
-    language: str,
-    person: Person,
-    mode: str,
-) -> int:
-    return await _show_description_list(update, context, language, person, mode)
-
-
 async def _show_description_list(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -833,7 +1046,8 @@ async def _show_description_list(
     person: Person,
     mode: str,
 ) -> int:
-    db: Database = context.bot_data["db"]
+    user_data = context.user_data
+    db = _get_db(context)
     descriptions = await db.list_person_descriptions(person.id)
     if not descriptions:
         target = get_reply_target(update)
@@ -842,15 +1056,15 @@ async def _show_description_list(
                 name=person.name
             )
         )
-        context.user_data["person_state"] = MANAGE_DESCRIPTION_SELECT
-        context.user_data.pop("person_descriptions", None)
-        context.user_data.pop("selected_description", None)
-        context.user_data.pop("person", None)
+        user_data["person_state"] = MANAGE_DESCRIPTION_SELECT
+        user_data.pop("person_descriptions", None)
+        user_data.pop("selected_description", None)
+        user_data.pop("person", None)
         _reset_person_menu_context(context)
-        return await prompt_person_selection(update, context)
+        return await prompt_person_selection(update, context, language)
 
-    context.user_data["person_descriptions"] = descriptions
-    context.user_data.pop("selected_description", None)
+    user_data["person_descriptions"] = descriptions
+    user_data.pop("selected_description", None)
     prompt_key = (
         "description_management_choose_edit"
         if mode == "edit"
@@ -867,39 +1081,40 @@ async def _show_description_list(
     else:
         target = get_reply_target(update)
         await target.reply_text(message, reply_markup=keyboard)
-    context.user_data["person_state"] = MANAGE_DESCRIPTION_CHOOSE
+    user_data["person_state"] = MANAGE_DESCRIPTION_CHOOSE
     return MANAGE_DESCRIPTION_CHOOSE
 
 
 async def handle_description_choice(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
+    user_data = context.user_data
     query = update.callback_query
     if not query or not query.data:
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
     parts = query.data.split(":", 2)
     if len(parts) < 2:
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     action = parts[1]
-    person: Optional[Person] = context.user_data.get("person")
-    mode = context.user_data.get("description_mode", "edit")
+    person: Optional[Person] = user_data.get("person")
+    mode = user_data.get("description_mode", "edit")
 
     if action == "back_contact":
         await query.answer()
-        context.user_data["person_state"] = MANAGE_DESCRIPTION_SELECT
-        context.user_data.pop("person", None)
-        context.user_data.pop("person_descriptions", None)
-        context.user_data.pop("selected_description", None)
+        user_data["person_state"] = MANAGE_DESCRIPTION_SELECT
+        user_data.pop("person", None)
+        user_data.pop("person_descriptions", None)
+        user_data.pop("selected_description", None)
         _reset_person_menu_context(context)
-        return await prompt_person_selection(update, context)
+        return await prompt_person_selection(update, context, language)
 
     if action != "select" or len(parts) != 3:
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     if not person:
         return await cancel(update, context)
@@ -908,15 +1123,15 @@ async def handle_description_choice(
         index = int(parts[2])
     except ValueError:
         await query.answer(get_text("not_found", language), show_alert=True)
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
-    descriptions: Sequence[str] = context.user_data.get("person_descriptions", [])
+    descriptions: Sequence[str] = user_data.get("person_descriptions", [])
     if index < 0 or index >= len(descriptions):
         await query.answer(get_text("not_found", language), show_alert=True)
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     selected = descriptions[index]
-    context.user_data["selected_description"] = selected
+    user_data["selected_description"] = selected
     label = _get_description_label(selected, language)
 
     if mode == "delete":
@@ -930,7 +1145,7 @@ async def handle_description_choice(
         await query.answer()
         if query.message:
             await query.message.edit_text(message, reply_markup=keyboard)
-        context.user_data["person_state"] = MANAGE_DESCRIPTION_CONFIRM_DELETE
+        user_data["person_state"] = MANAGE_DESCRIPTION_CONFIRM_DELETE
         return MANAGE_DESCRIPTION_CONFIRM_DELETE
 
     message = with_cancel_hint(
@@ -943,7 +1158,7 @@ async def handle_description_choice(
     await query.answer()
     if query.message:
         await query.message.edit_text(message, reply_markup=keyboard)
-    context.user_data["person_state"] = MANAGE_DESCRIPTION_EDIT
+    user_data["person_state"] = MANAGE_DESCRIPTION_EDIT
     return MANAGE_DESCRIPTION_EDIT
 
 
@@ -968,46 +1183,45 @@ async def handle_description_back_to_list(
 async def handle_description_delete_confirmation(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
+    user_data = context.user_data
     query = update.callback_query
     if not query or not query.data:
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
     parts = query.data.split(":", 2)
     if len(parts) != 3 or parts[1] != "delete":
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     action = parts[2]
-    person: Optional[Person] = context.user_data.get("person")
-    selected = context.user_data.get("selected_description")
+    person: Optional[Person] = user_data.get("person")
+    selected = user_data.get("selected_description")
     if not person or selected is None:
         return await cancel(update, context)
 
     if action == "back":
         await query.answer()
-        context.user_data.pop("selected_description", None)
+        user_data.pop("selected_description", None)
         return await _show_description_list(
-            update, context, language, person, context.user_data.get("description_mode", "delete")
+            update, context, language, person, user_data.get("description_mode", "delete")
         )
 
     if action != "confirm":
         await query.answer()
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     affected = await db.clear_person_description(person.id, selected)
     if affected == 0:
         await query.answer()
         if query.message:
             await query.message.edit_text(
-                with_cancel_hint(
-                    get_text("description_management_not_found", language), language
-                )
+                _cancel_prompt("description_management_not_found", language)
             )
-        context.user_data.pop("selected_description", None)
+        user_data.pop("selected_description", None)
         return await _show_description_list(
-            update, context, language, person, context.user_data.get("description_mode", "delete")
+            update, context, language, person, user_data.get("description_mode", "delete")
         )
 
     await query.answer()
@@ -1036,14 +1250,11 @@ async def receive_description_edit(
     new_value = update.message.text.strip()
     if not new_value:
         await update.message.reply_text(
-            with_cancel_hint(
-                get_text("description_management_invalid_new_value", language),
-                language,
-            )
+            _cancel_prompt("description_management_invalid_new_value", language)
         )
         return MANAGE_DESCRIPTION_EDIT
 
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     affected = await db.update_person_description(person.id, selected, new_value)
     if affected == 0:
         await update.message.reply_text(
@@ -1056,17 +1267,18 @@ async def receive_description_edit(
     confirmation = get_text("description_management_edit_success", language).format(
         name=person.name
     )
-    await update.message.reply_text(confirmation)
     LOGGER.info(
         "Updated description for person_id=%s from '%s' to '%s'",
         person.id,
         selected,
-        new_value.strip(),
+        new_value,
     )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(update, context, language, notice=confirmation)
     return ConversationHandler.END
 
+
+@lru_cache(maxsize=len(_LANGUAGES) * 2)
 def compose_start_message(language: str) -> str:
     lines = [get_text("start_message", language), ""]
     lines.append(get_text("start_command_overview", language))
@@ -1088,8 +1300,13 @@ def compose_start_message(language: str) -> str:
     return "\n".join(lines)
 
 
-async def send_start_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    language = await get_language(context, update.effective_user.id)
+async def send_start_message(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    language: Optional[str] = None,
+) -> None:
+    if language is None:
+        language = await get_language(context, update.effective_user.id)
     message = compose_start_message(language)
     if update.message:
         await update.message.reply_text(
@@ -1110,10 +1327,20 @@ async def send_main_menu_reply(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
     language: Optional[str] = None,
+    *,
+    notice: Optional[str] = None,
 ) -> None:
+    """Reply with the main menu, optionally prefixed by a one-off ``notice``.
+
+    Folding the outcome of a workflow into the menu message saves a separate
+    Bot API request.
+    """
+
     if language is None:
         language = await get_language(context, update.effective_user.id)
     message = compose_start_message(language)
+    if notice:
+        message = f"{notice}\n\n{message}"
     target = get_reply_target(update)
     await target.reply_text(
         message,
@@ -1132,8 +1359,11 @@ async def show_help(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
 
 async def show_dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # Cleared up front: the /dashboard command does not block, so a workflow
+    # started while the summary loads must survive.
+    clear_workflow(context)
     language = await get_language(context, update.effective_user.id)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     summary = await db.get_dashboard_summary()
     text = format_dashboard(summary, language)
     if update.callback_query:
@@ -1144,7 +1374,6 @@ async def show_dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         disable_web_page_preview=True,
         reply_markup=back_to_main_menu_keyboard(language),
     )
-    clear_workflow(context)
 
 
 async def go_back_to_main_menu(
@@ -1159,12 +1388,12 @@ async def start_export_transactions(
 ) -> int:
     language = await get_language(context, update.effective_user.id)
     clear_workflow(context)
-    context.user_data["flow"] = "export"
+    _begin_workflow(context, "export")
     context.user_data["export_mode"] = "all"
     await answer_callback(update)
     target = get_reply_target(update)
     message = await target.reply_text(
-        with_cancel_hint(get_text("export_choose_type", language), language),
+        _cancel_prompt("export_choose_type", language),
         reply_markup=export_mode_keyboard(language),
     )
     _remember_prompt_message(update, context, getattr(message, "message_id", None))
@@ -1211,10 +1440,7 @@ async def handle_export_contact_choice(
         return EXPORT_CONTACT_CHOICE
 
     choice = parts[2]
-    await query.answer()
-
-    if query.message:
-        await query.message.edit_reply_markup(reply_markup=None)
+    await _answer_and_clear_markup(query)
 
     if choice == "all":
         return await perform_export(update, context, language, person_ids=None)
@@ -1223,7 +1449,7 @@ async def handle_export_contact_choice(
         context.user_data["person_state"] = EXPORT_PERSON
         context.user_data.pop("person_next_state", None)
         context.user_data.pop("entry_mode", None)
-        return await prompt_person_selection(update, context)
+        return await prompt_person_selection(update, context, language)
 
     return EXPORT_CONTACT_CHOICE
 
@@ -1235,6 +1461,58 @@ async def skip_export_contacts(
     return await perform_export(update, context, language, person_ids=None)
 
 
+class _CsvExportWriter:
+    """Incrementally encode exported transaction rows as a UTF-8 CSV."""
+
+    __slots__ = ("_document", "_text", "_writer", "_debt_label", "_payment_label", "row_count")
+
+    def __init__(self, language: str) -> None:
+        self._document = BytesIO()
+        self._text = TextIOWrapper(
+            self._document, encoding="utf-8", newline="", write_through=True
+        )
+        self._writer = csv.writer(self._text)
+        self._debt_label = get_text("export_type_label_debt", language)
+        self._payment_label = get_text("export_type_label_payment", language)
+        self.row_count = 0
+        self._writer.writerow(
+            [
+                get_text("export_column_transaction_id", language),
+                get_text("export_column_contact", language),
+                get_text("export_column_contact_id", language),
+                get_text("export_column_type", language),
+                get_text("export_column_amount", language),
+                get_text("export_column_description", language),
+                get_text("export_column_created_at", language),
+            ]
+        )
+
+    def _encode_row(self, row: Any) -> Tuple[Any, ...]:
+        amount = int(row["amount"])
+        return (
+            row["id"],
+            row["person_name"],
+            row["person_id"],
+            self._debt_label if amount > 0 else self._payment_label,
+            _format_amount(abs(amount)),
+            row["description"] or "-",
+            row["created_at"],
+        )
+
+    def write_rows(self, rows: Sequence[Any]) -> None:
+        self._writer.writerows(map(self._encode_row, rows))
+        self.row_count += len(rows)
+
+    def finish(self) -> BytesIO:
+        """Return the encoded document positioned at its start."""
+
+        self._text.flush()
+        # Detach so closing the wrapper later cannot close the underlying buffer.
+        self._text.detach()
+        self._document.seek(0)
+        return self._document
+
+
 async def perform_export(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -1243,7 +1521,7 @@ async def perform_export(
     person_ids: Optional[Sequence[int]],
 ) -> int:
     await answer_callback(update)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
 
     mode = context.user_data.get("export_mode", "all")
     amount_filter: Optional[str]
@@ -1254,59 +1532,35 @@ async def perform_export(
     else:
         amount_filter = None
 
+    export = _CsvExportWriter(language)
     try:
-        rows = await db.export_transactions(
+        async for batch in db.iter_export_transactions(
             amount_filter=amount_filter,
             person_ids=person_ids,
-        )
+        ):
+            # Encoding is pure Python; keep it off the event loop for large exports.
+            await asyncio.to_thread(export.write_rows, batch)
     except Exception:  # pragma: no cover - defensive logging
         LOGGER.exception("Failed to export transactions")
         target = get_reply_target(update)
-        await target.reply_text(get_text("export_error", language))
         clear_workflow(context)
-        await send_main_menu_reply(update, context, language)
+        await send_main_menu_reply(
+            update, context, language, notice=get_text("export_error", language)
+        )
         return ConversationHandler.END
 
-    if not rows:
+    if not export.row_count:
         target = get_reply_target(update)
-        await target.reply_text(get_text("export_no_transactions", language))
         clear_workflow(context)
-        await send_main_menu_reply(update, context, language)
-        return ConversationHandler.END
-
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(
-        [
-            get_text("export_column_transaction_id", language),
-            get_text("export_column_contact", language),
-            get_text("export_column_contact_id", language),
-            get_text("export_column_type", language),
-            get_text("export_column_amount", language),
-            get_text("export_column_description", language),
-            get_text("export_column_created_at", language),
-        ]
-    )
-
-    for row in rows:
-        amount = int(row["amount"])
-        type_key = (
-            "export_type_label_debt" if amount > 0 else "export_type_label_payment"
-        )
-        writer.writerow(
-            [
-                row["id"],
-                row["person_name"],
-                row["person_id"],
-                get_text(type_key, language),
-                _format_amount(abs(amount)),
-                row["description"] or "-",
-                row["created_at"],
-            ]
+        await send_main_menu_reply(
+            update,
+            context,
+            language,
+            notice=get_text("export_no_transactions", language),
         )
+        return ConversationHandler.END
 
-    buffer.seek(0)
-    document = BytesIO(buffer.getvalue().encode("utf-8"))
+    document = export.finish()
 
     suffix = ""
     if person_ids:
@@ -1316,7 +1570,7 @@ async def perform_export(
             suffix = "-filtered"
 
     document.name = (
-        f"transactions{suffix}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.csv"
+        f"transactions{suffix}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.csv"
     )
 
     target = get_reply_target(update)
@@ -1329,17 +1583,24 @@ async def perform_export(
     return ConversationHandler.END
 
 
+def _begin_workflow(
+    context: ContextTypes.DEFAULT_TYPE, flow: Optional[str] = None
+) -> None:
+    """Mark the user as being inside a workflow, optionally naming the flow."""
+
+    if flow is not None:
+        context.user_data["flow"] = flow
+    context.user_data[_WORKFLOW_ACTIVE_KEY] = True
+
+
 def _has_active_workflow(context: ContextTypes.DEFAULT_TYPE) -> bool:
     """Return ``True`` when the user currently has an active workflow."""
 
-    for key in ("flow", "person_state", "person_next_state", "entry_mode"):
-        if context.user_data.get(key) is not None:
-            return True
-    return False
+    return context.user_data.get(_WORKFLOW_ACTIVE_KEY, False)
 
 
-def clear_workflow(context: ContextTypes.DEFAULT_TYPE) -> None:
-    for key in (
+_WORKFLOW_KEYS = frozenset(
+    {
         "flow",
         "person",
         "amount",
@@ -1354,24 +1615,27 @@ def clear_workflow(context: ContextTypes.DEFAULT_TYPE) -> None:
         "description_mode",
         "person_descriptions",
         "selected_description",
-    ):
-        context.user_data.pop(key, None)
-    _reset_person_menu_context(context)
+        _LANGUAGE_KEYBOARD_OPEN_KEY,
+        _WORKFLOW_ACTIVE_KEY,
+    }
+) | _PERSON_MENU_KEYS
+
+
+def clear_workflow(context: ContextTypes.DEFAULT_TYPE) -> None:
+    _discard_keys(context.user_data, _WORKFLOW_KEYS)
     _drop_prompt_message(context)
 
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
     clear_workflow(context)
-    if update.message:
-        await update.message.reply_text(get_text("action_cancelled", language))
-    elif update.callback_query:
-        await update.callback_query.answer(get_text("action_cancelled", language))
-        await update.callback_query.message.edit_text(
-            get_text("action_cancelled", language),
-            reply_markup=None,
-        )
-    await send_main_menu_reply(update, context, language)
+    cancelled = get_text("action_cancelled", language)
+    if update.callback_query:
+        await update.callback_query.answer(cancelled)
+        await update.callback_query.message.edit_text(cancelled, reply_markup=None)
+        await send_main_menu_reply(update, context, language)
+    else:
+        await send_main_menu_reply(update, context, language, notice=cancelled)
     return ConversationHandler.END
 
 
@@ -1381,7 +1645,7 @@ async def prompt_person_name(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await answer_callback(update)
     target = get_reply_target(update)
     message = await target.reply_text(
-        with_cancel_hint(get_text("enter_person_name", language), language),
+        _cancel_prompt("enter_person_name", language),
         reply_markup=cancel_keyboard(language),
     )
     _remember_prompt_message(update, context, getattr(message, "message_id", None))
@@ -1391,7 +1655,7 @@ async def prompt_person_name(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def save_person_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
     name = update.message.text.strip()
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     try:
         person = await db.add_person(name)
     except InvalidPersonNameError:
@@ -1402,20 +1666,27 @@ async def save_person_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             get_text("duplicate_person_name", language).format(name=name)
         )
         return ADD_PERSON_NAME
-    await update.message.reply_text(
-        get_text("person_added", language).format(name=person.name, id=person.id),
-    )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(
+        update,
+        context,
+        language,
+        notice=get_text("person_added", language).format(
+            name=person.name, id=person.id
+        ),
+    )
     return ConversationHandler.END
 
 
 async def prompt_person_selection(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    language: Optional[str] = None,
 ) -> int:
-    language = await get_language(context, update.effective_user.id)
+    if language is None:
+        language = await get_language(context, update.effective_user.id)
     context.user_data.pop("entry_mode", None)
-    await answer_callback(update)
+    answer_callback_soon(update, context)
     target = get_reply_target(update)
     flow = context.user_data.get("flow")
     if flow == "export":
@@ -1436,20 +1707,19 @@ async def advance_person_workflow(
     person: Person,
     language: str,
 ) -> int:
-    context.user_data["person"] = person
+    user_data = context.user_data
+    user_data["person"] = person
     target = get_reply_target(update)
-    next_state = context.user_data.get("person_next_state", ConversationHandler.END)
-    flow = context.user_data.get("flow")
-    entry_mode = context.user_data.get("entry_mode")
+    next_state = user_data.get("person_next_state", ConversationHandler.END)
+    flow = user_data.get("flow")
+    entry_mode = user_data.get("entry_mode")
 
     if flow == "manage_person":
         return await prompt_manage_person_action(update, context, language, person)
 
     if flow == "manage_description":
-        mode = context.user_data.get("description_mode", "edit")
-        return await prompt_manage_description_action(
-            update, context, language, person, mode
-        )
+        mode = user_data.get("description_mode", "edit")
+        return await _show_description_list(update, context, language, person, mode)
 
     if flow == "export":
         return await perform_export(
@@ -1459,45 +1729,57 @@ async def advance_person_workflow(
             person_ids=[person.id],
         )
 
-    if flow == "debt" and entry_mode == "menu":
-        context.user_data.pop("amount", None)
-        context.user_data.pop("description", None)
-        context.user_data["person_state"] = DEBT_AMOUNT
+    amount_prompt = _MENU_AMOUNT_PROMPTS.get(flow) if entry_mode == "menu" else None
+    if amount_prompt is not None:
+        prompt_key, amount_state = amount_prompt
+        user_data.pop("amount", None)
+        user_data.pop("description", None)
+        user_data["person_state"] = amount_state
         await target.reply_text(
             with_cancel_hint(
-                get_text("enter_debt_amount", language).format(name=person.name),
+                get_text(prompt_key, language).format(name=person.name),
                 language,
             ),
             reply_markup=cancel_keyboard(language),
         )
-        return DEBT_AMOUNT
-
-    if flow == "payment" and entry_mode == "menu":
-        context.user_data.pop("amount", None)
-        context.user_data.pop("description", None)
-        context.user_data["person_state"] = PAYMENT_AMOUNT
-        await target.reply_text(
-            with_cancel_hint(
-                get_text("enter_payment_amount", language).format(name=person.name),
-                language,
-            ),
-            reply_markup=cancel_keyboard(language),
-        )
-        return PAYMENT_AMOUNT
+        return amount_state
 
     if next_state == HISTORY_DATES:
         message = await target.reply_text(
-            with_cancel_hint(get_text("history_choose_range", language), language),
+            _cancel_prompt("history_choose_range", language),
             reply_markup=history_range_keyboard(language),
         )
         _remember_prompt_message(update, context, getattr(message, "message_id", None))
         return HISTORY_DATES
 
-    if context.user_data.get("person_state") == SEARCH_QUERY:
+    if user_data.get("person_state") == SEARCH_QUERY:
         return SEARCH_QUERY
     return ConversationHandler.END
 
 
+def _filter_people_by_name(
+    people: Iterable[PersonUsageStats], query: str
+) -> list[PersonUsageStats]:
+    """Return the entries whose name contains ``query``, ignoring case."""
+
+    needle = query.casefold()
+    return [entry for entry in people if needle in entry.person.name.casefold()]
+
+
+def _cached_person_menu_list(
+    context: ContextTypes.DEFAULT_TYPE,
+) -> Optional[Sequence[PersonUsageStats]]:
+    """Return the unfiltered list loaded when this menu was opened, if any.
+
+    Paging and searching reuse it instead of querying again; opening the menu
+    afresh resets the context and so picks up new contacts.
+    """
+
+    if context.user_data.get("person_menu_mode") != "all":
+        return None
+    return context.user_data.get("person_menu_results")
+
+
 async def show_person_menu(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -1505,18 +1787,17 @@ async def show_person_menu(
     page: int = 0,
     search_query: Optional[str] = None,
 ) -> int:
-    db: Database = context.bot_data["db"]
+    user_data = context.user_data
+    db = _get_db(context)
     search_mode = False
     people: Sequence[PersonUsageStats]
     query_text: Optional[str] = None
 
     if search_query is not None:
-        all_people = await db.list_people_with_usage()
-        filtered = [
-            entry
-            for entry in all_people
-            if search_query.casefold() in entry.person.name.casefold()
-        ]
+        all_people = _cached_person_menu_list(context)
+        if all_people is None:
+            all_people = await db.list_people_with_usage()
+        filtered = _filter_people_by_name(all_people, search_query)
         if not filtered:
             target = get_reply_target(update)
             await target.reply_text(get_text("menu_search_no_results", language))
@@ -1525,42 +1806,39 @@ async def show_person_menu(
         search_mode = True
         query_text = search_query
         people = filtered
-        context.user_data["person_menu_mode"] = "search"
-        context.user_data["person_menu_search_query"] = search_query
-        context.user_data["person_menu_results"] = filtered
-        context.user_data["person_menu_search_expected"] = False
+        user_data["person_menu_mode"] = "search"
+        user_data["person_menu_search_query"] = search_query
+        user_data["person_menu_results"] = filtered
+        user_data["person_menu_search_expected"] = False
         page = 0
     else:
-        mode = context.user_data.get("person_menu_mode")
-        stored_query = context.user_data.get("person_menu_search_query")
-        stored_results = context.user_data.get("person_menu_results")
+        mode = user_data.get("person_menu_mode")
+        stored_query = user_data.get("person_menu_search_query")
+        stored_results = user_data.get("person_menu_results")
         if mode == "search" and stored_query:
             search_mode = True
             query_text = stored_query
             if stored_results is None:
                 all_people = await db.list_people_with_usage()
-                stored_results = [
-                    entry
-                    for entry in all_people
-                    if stored_query.casefold() in entry.person.name.casefold()
-                ]
-                context.user_data["person_menu_results"] = stored_results
+                stored_results = _filter_people_by_name(all_people, stored_query)
+                user_data["person_menu_results"] = stored_results
             people = stored_results or []
         else:
-            people = await db.list_people_with_usage()
+            cached = _cached_person_menu_list(context)
+            people = cached if cached is not None else await db.list_people_with_usage()
             if not people:
                 target = get_reply_target(update)
                 await target.reply_text(
-                    with_cancel_hint(get_text("no_people", language), language),
+                    _cancel_prompt("no_people", language),
                     reply_markup=cancel_keyboard(language),
                 )
-                context.user_data.pop("entry_mode", None)
+                user_data.pop("entry_mode", None)
                 _reset_person_menu_context(context)
-                return context.user_data.get("person_state", ConversationHandler.END)
-            context.user_data["person_menu_mode"] = "all"
-            context.user_data["person_menu_results"] = people
-            context.user_data.pop("person_menu_search_query", None)
-            context.user_data["person_menu_search_expected"] = False
+                return user_data.get("person_state", ConversationHandler.END)
+            user_data["person_menu_mode"] = "all"
+            user_data["person_menu_results"] = people
+            user_data.pop("person_menu_search_query", None)
+            user_data["person_menu_search_expected"] = False
 
     if search_mode and not people:
         target = get_reply_target(update)
@@ -1597,12 +1875,14 @@ async def show_person_menu(
     query = update.callback_query
     if query and query.message:
         await query.message.edit_text(message, reply_markup=keyboard)
+        menu_message = query.message
     else:
         target = get_reply_target(update)
-        await target.reply_text(message, reply_markup=keyboard)
+        menu_message = await target.reply_text(message, reply_markup=keyboard)
 
-    context.user_data["person_menu_page"] = page
-    return context.user_data.get("person_state", ConversationHandler.END)
+    user_data["person_menu_page"] = page
+    user_data["person_menu_message_id"] = getattr(menu_message, "message_id", None)
+    return user_data.get("person_state", ConversationHandler.END)
 
 
 async def handle_person_menu_search(
@@ -1613,8 +1893,9 @@ async def handle_person_menu_search(
         return context.user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
-    parts = query.data.split(":", 1)
-    action = parts[1] if len(parts) == 2 else "start"
+    _, separator, action = query.data.partition(":")
+    if not separator:
+        action = "start"
 
     await query.answer()
 
@@ -1629,12 +1910,11 @@ async def handle_person_menu_search(
 
 
 async def _maybe_handle_person_menu_search_message(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
+    update: Update, context: ContextTypes.DEFAULT_TYPE, language: str
 ) -> Optional[int]:
     if not context.user_data.get("person_menu_search_expected"):
         return None
 
-    language = await get_language(context, update.effective_user.id)
     text = update.message.text.strip()
     if not text:
         await update.message.reply_text(get_text("menu_search_question", language))
@@ -1648,22 +1928,22 @@ async def _maybe_handle_person_menu_search_message(
 async def handle_selection_method(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
+    user_data = context.user_data
     query = update.callback_query
     if not query or not query.data:
-        return context.user_data.get("person_state", ConversationHandler.END)
+        return user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
-    payload = query.data.split(":", 1)
-    state = context.user_data.get("person_state", ConversationHandler.END)
-    if len(payload) != 2:
+    _, separator, method = query.data.partition(":")
+    state = user_data.get("person_state", ConversationHandler.END)
+    if not separator:
         await query.answer()
         return state
-    method = payload[1]
-    flow = context.user_data.get("flow")
+    flow = user_data.get("flow")
 
     if method == "id":
-        context.user_data["entry_mode"] = "id"
-        context.user_data.pop("person", None)
+        user_data["entry_mode"] = "id"
+        user_data.pop("person", None)
         _reset_person_menu_context(context)
         if flow == "debt":
             message = "\n".join(
@@ -1692,8 +1972,8 @@ async def handle_selection_method(
         return state
 
     if method == "menu":
-        context.user_data["entry_mode"] = "menu"
-        context.user_data.pop("person", None)
+        user_data["entry_mode"] = "menu"
+        user_data.pop("person", None)
         _reset_person_menu_context(context)
         await query.answer()
         return await show_person_menu(update, context, language, page=0)
@@ -1710,49 +1990,59 @@ async def handle_person_menu_navigation(
         return context.user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
-    try:
-        _, page_str = query.data.split(":", 1)
-        page = int(page_str)
-    except (ValueError, IndexError):
+    page = _parse_callback_id(query.data)
+    if page is None:
         await query.answer()
         return context.user_data.get("person_state", ConversationHandler.END)
 
     await query.answer()
+    # Updates from one chat are handled in order, so rapid taps on the same
+    # button arrive after the first has already rendered the page. Taps on an
+    # older menu message still redraw it.
+    user_data = context.user_data
+    if (
+        page == user_data.get("person_menu_page")
+        and query.message is not None
+        and query.message.message_id == user_data.get("person_menu_message_id")
+    ):
+        return user_data.get("person_state", ConversationHandler.END)
     return await show_person_menu(update, context, language, page)
 
 
 async def receive_person_reference(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    maybe_state = await _maybe_handle_person_menu_search_message(update, context)
+    language = await get_language(context, update.effective_user.id)
+    maybe_state = await _maybe_handle_person_menu_search_message(
+        update, context, language
+    )
     if maybe_state is not None:
         return maybe_state
 
-    language = await get_language(context, update.effective_user.id)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     text = update.message.text.strip()
     state = context.user_data.get("person_state", ConversationHandler.END)
     if not text:
         await update.message.reply_text(
-            with_cancel_hint(get_text("person_id_or_menu_hint", language), language),
+            _cancel_prompt("person_id_or_menu_hint", language),
             reply_markup=cancel_keyboard(language),
         )
         return state
 
-    normalized = text.lstrip("#")
+    person_id = _parse_person_reference(text)
     person: Optional[Person] = None
-    if normalized.isdigit():
-        person = await db.get_person(int(normalized))
+    if person_id is not None:
+        person = await db.get_person(person_id)
         if not person:
-            await update.message.reply_text(get_text("not_found", language))
+            hint = _cancel_prompt("person_id_or_menu_hint", language)
             await update.message.reply_text(
-                with_cancel_hint(get_text("person_id_or_menu_hint", language), language),
+                f"{get_text('not_found', language)}\n\n{hint}",
                 reply_markup=cancel_keyboard(language),
             )
             return state
     else:
         await update.message.reply_text(
-            with_cancel_hint(get_text("person_id_or_menu_hint", language), language),
+            _cancel_prompt("person_id_or_menu_hint", language),
             reply_markup=cancel_keyboard(language),
         )
         return state
@@ -1764,19 +2054,18 @@ async def _handle_person_selection_failure(
     update: Update, context: ContextTypes.DEFAULT_TYPE, language: str
 ) -> int:
     target = get_reply_target(update)
-    await target.reply_text(get_text("not_found", language))
+    not_found = get_text("not_found", language)
     state = context.user_data.get("person_state", ConversationHandler.END)
-    if state == SEARCH_QUERY:
-        await target.reply_text(
-            with_cancel_hint(get_text("search_filters_hint", language), language),
-            reply_markup=cancel_keyboard(language),
-        )
-        return SEARCH_QUERY
-    if state != ConversationHandler.END:
-        await target.reply_text(
-            with_cancel_hint(get_text("person_id_or_menu_hint", language), language),
-            reply_markup=cancel_keyboard(language),
-        )
+    if state == ConversationHandler.END:
+        await target.reply_text(not_found)
+        return state
+
+    hint_key = "search_filters_hint" if state == SEARCH_QUERY else "person_id_or_menu_hint"
+    hint = _cancel_prompt(hint_key, language)
+    await target.reply_text(
+        f"{not_found}\n\n{hint}",
+        reply_markup=cancel_keyboard(language),
+    )
     return state
 
 
@@ -1788,16 +2077,13 @@ async def handle_person_selection(
         return context.user_data.get("person_state", ConversationHandler.END)
 
     language = await get_language(context, update.effective_user.id)
-    await query.answer()
-    if query.message:
-        await query.message.edit_reply_markup(reply_markup=None)
+    await _answer_and_clear_markup(query)
 
-    payload = query.data.split(":", 1)
-    if len(payload) != 2 or not payload[1].isdigit():
+    person_id = _parse_callback_id(query.data)
+    if person_id is None:
         return await _handle_person_selection_failure(update, context, language)
 
-    person_id = int(payload[1])
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     person = await db.get_person(person_id)
     if not person:
         return await _handle_person_selection_failure(update, context, language)
@@ -1809,56 +2095,55 @@ async def handle_person_selection(
 # ---- Add Debt ----
 async def start_add_debt(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     clear_workflow(context)
-    context.user_data["flow"] = "debt"
+    _begin_workflow(context, "debt")
     context.user_data["person_state"] = DEBT_ENTRY
     return await prompt_person_selection(update, context)
 
 
 async def receive_debt_entry(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    maybe_state = await _maybe_handle_person_menu_search_message(update, context)
+    language = await get_language(context, update.effective_user.id)
+    maybe_state = await _maybe_handle_person_menu_search_message(
+        update, context, language
+    )
     if maybe_state is not None:
         return maybe_state
 
-    language = await get_language(context, update.effective_user.id)
     text = update.message.text.strip()
     parts = text.split(None, 2)
     if len(parts) < 3:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_format", language), language)
+            _cancel_prompt("quick_entry_invalid_format", language)
         )
         return DEBT_ENTRY
 
     raw_id, raw_amount, description = parts[0], parts[1], parts[2].strip()
-    person_id = raw_id.lstrip("#")
-    if not person_id.isdigit():
+    person_id = _parse_person_reference(raw_id)
+    if person_id is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_id", language), language)
+            _cancel_prompt("quick_entry_invalid_id", language)
         )
         return DEBT_ENTRY
 
     amount = _parse_positive_amount(raw_amount)
     if amount is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_amount", language), language)
+            _cancel_prompt("quick_entry_invalid_amount", language)
         )
         return DEBT_ENTRY
 
-    db: Database = context.bot_data["db"]
-    person = await db.get_person(int(person_id))
-    if not person:
+    db = _get_db(context)
+    recorded = await db.add_transaction_for_person(person_id, amount, description)
+    if recorded is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_person_not_found", language), language)
+            _cancel_prompt("quick_entry_person_not_found", language)
         )
         return DEBT_ENTRY
 
-    await db.add_transaction(person.id, amount, description)
-    balance = await db.get_balance(person.id)
-    await update.message.reply_text(
-        get_text("debt_recorded", language).format(
-            name=person.name,
-            amount=_format_amount(amount),
-            balance=_format_amount(balance),
-        )
+    person, balance = recorded
+    notice = get_text("debt_recorded", language).format(
+        name=person.name,
+        amount=_format_amount(amount),
+        balance=_format_amount(balance),
     )
     LOGGER.info(
         "Debt recorded for person_id=%s amount=%s description=%s",
@@ -1867,7 +2152,7 @@ async def receive_debt_entry(update: Update, context: ContextTypes.DEFAULT_TYPE)
         description,
     )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(update, context, language, notice=notice)
     return ConversationHandler.END
 
 
@@ -1877,22 +2162,18 @@ async def receive_debt_amount(update: Update, context: ContextTypes.DEFAULT_TYPE
     if not person:
         return await cancel(update, context)
 
-    text = update.message.text.strip()
-    amount = _parse_positive_amount(text)
+    amount = _parse_positive_amount(update.message.text)
     if amount is None:
         context.user_data["person_state"] = DEBT_AMOUNT
         await update.message.reply_text(
-            with_cancel_hint(get_text("invalid_number", language), language),
+            _cancel_prompt("invalid_number", language),
             reply_markup=cancel_keyboard(language),
         )
         return DEBT_AMOUNT
 
     context.user_data["amount"] = amount
     context.user_data["person_state"] = DEBT_DESCRIPTION
-    message = with_cancel_hint(
-        get_text("enter_debt_description", language),
-        language,
-    )
+    message = _cancel_prompt("enter_debt_description", language)
     await update.message.reply_text(
         message,
         reply_markup=skip_keyboard(language, "debt_description"),
@@ -1900,28 +2181,41 @@ async def receive_debt_amount(update: Update, context: ContextTypes.DEFAULT_TYPE
     return DEBT_DESCRIPTION
 
 
+async def _end_for_missing_person(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, language: str
+) -> int:
+    """End a workflow whose contact was deleted after it was picked."""
+
+    clear_workflow(context)
+    await send_main_menu_reply(
+        update, context, language, notice=get_text("not_found", language)
+    )
+    return ConversationHandler.END
+
+
 async def _complete_menu_debt(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
     language: str,
     description: str,
 ) -> int:
-    person: Optional[Person] = context.user_data.get("person")
-    amount = context.user_data.get("amount")
+    user_data = context.user_data
+    person: Optional[Person] = user_data.get("person")
+    amount = user_data.get("amount")
     if not person or amount is None:
         return await cancel(update, context)
 
     amount_value = int(amount)
-    db: Database = context.bot_data["db"]
-    await db.add_transaction(person.id, amount_value, description)
-    balance = await db.get_balance(person.id)
-    target = get_reply_target(update)
-    await target.reply_text(
-        get_text("debt_recorded", language).format(
-            name=person.name,
-            amount=_format_amount(amount_value),
-            balance=_format_amount(balance),
-        )
+    db = _get_db(context)
+    recorded = await db.add_transaction_for_person(person.id, amount_value, description)
+    if recorded is None:
+        return await _end_for_missing_person(update, context, language)
+
+    person, balance = recorded
+    notice = get_text("debt_recorded", language).format(
+        name=person.name,
+        amount=_format_amount(amount_value),
+        balance=_format_amount(balance),
     )
     LOGGER.info(
         "Debt recorded for person_id=%s amount=%s description=%s",
@@ -1930,7 +2224,7 @@ async def _complete_menu_debt(
         description,
     )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(update, context, language, notice=notice)
     return ConversationHandler.END
 
 
@@ -1945,64 +2239,63 @@ async def receive_debt_description(
 async def skip_debt_description(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
     if update.callback_query:
-        await update.callback_query.answer()
-        if update.callback_query.message:
-            await update.callback_query.message.edit_reply_markup(reply_markup=None)
+        await _answer_and_clear_markup(update.callback_query)
     return await _complete_menu_debt(update, context, language, "")
 
 
 # ---- Payments ----
 async def start_payment(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     clear_workflow(context)
-    context.user_data["flow"] = "payment"
+    _begin_workflow(context, "payment")
     context.user_data["person_state"] = PAYMENT_ENTRY
     return await prompt_person_selection(update, context)
 
 
 async def receive_payment_entry(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    maybe_state = await _maybe_handle_person_menu_search_message(update, context)
+    language = await get_language(context, update.effective_user.id)
+    maybe_state = await _maybe_handle_person_menu_search_message(
+        update, context, language
+    )
     if maybe_state is not None:
         return maybe_state
 
-    language = await get_language(context, update.effective_user.id)
     text = update.message.text.strip()
     parts = text.split(None, 2)
     if len(parts) < 3:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_format", language), language)
+            _cancel_prompt("quick_entry_invalid_format", language)
         )
         return PAYMENT_ENTRY
 
     raw_id, raw_amount, description = parts[0], parts[1], parts[2].strip()
-    person_id = raw_id.lstrip("#")
-    if not person_id.isdigit():
+    person_id = _parse_person_reference(raw_id)
+    if person_id is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_id", language), language)
+            _cancel_prompt("quick_entry_invalid_id", language)
         )
         return PAYMENT_ENTRY
 
     amount = _parse_positive_amount(raw_amount)
     if amount is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_invalid_amount", language), language)
+            _cancel_prompt("quick_entry_invalid_amount", language)
         )
         return PAYMENT_ENTRY
 
-    db: Database = context.bot_data["db"]
-    person = await db.get_person(int(person_id))
-    if not person:
+    db = _get_db(context)
+    stored_amount = -abs(amount)
+    recorded = await db.add_transaction_for_person(
+        person_id, stored_amount, description
+    )
+    if recorded is None:
         await update.message.reply_text(
-            with_cancel_hint(get_text("quick_entry_person_not_found", language), language)
+            _cancel_prompt("quick_entry_person_not_found", language)
         )
         return PAYMENT_ENTRY
 
-    stored_amount = -abs(amount)
-    await db.add_transaction(person.id, stored_amount, description)
-    balance = await db.get_balance(person.id)
-    await update.message.reply_text(
-        get_text("payment_recorded", language).format(
-            name=person.name, balance=_format_amount(balance)
-        )
+    person, balance = recorded
+    notice = get_text("payment_recorded", language).format(
+        name=person.name, balance=_format_amount(balance)
     )
     LOGGER.info(
         "Payment recorded for person_id=%s amount=%s description=%s",
@@ -2011,7 +2304,7 @@ async def receive_payment_entry(update: Update, context: ContextTypes.DEFAULT_TY
         description,
     )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(update, context, language, notice=notice)
     return ConversationHandler.END
 
 
@@ -2021,22 +2314,18 @@ async def receive_payment_amount(update: Update, context: ContextTypes.DEFAULT_T
     if not person:
         return await cancel(update, context)
 
-    text = update.message.text.strip()
-    amount = _parse_positive_amount(text)
+    amount = _parse_positive_amount(update.message.text)
     if amount is None:
         context.user_data["person_state"] = PAYMENT_AMOUNT
         await update.message.reply_text(
-            with_cancel_hint(get_text("invalid_number", language), language),
+            _cancel_prompt("invalid_number", language),
             reply_markup=cancel_keyboard(language),
         )
         return PAYMENT_AMOUNT
 
     context.user_data["amount"] = amount
     context.user_data["person_state"] = PAYMENT_DESCRIPTION
-    message = with_cancel_hint(
-        get_text("enter_payment_description", language),
-        language,
-    )
+    message = _cancel_prompt("enter_payment_description", language)
     await update.message.reply_text(
         message,
         reply_markup=skip_keyboard(language, "payment_description"),
@@ -2050,20 +2339,23 @@ async def _complete_menu_payment(
     language: str,
     description: str,
 ) -> int:
-    person: Optional[Person] = context.user_data.get("person")
-    amount = context.user_data.get("amount")
+    user_data = context.user_data
+    person: Optional[Person] = user_data.get("person")
+    amount = user_data.get("amount")
     if not person or amount is None:
         return await cancel(update, context)
 
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     stored_amount = -abs(int(amount))
-    await db.add_transaction(person.id, stored_amount, description)
-    balance = await db.get_balance(person.id)
-    target = get_reply_target(update)
-    await target.reply_text(
-        get_text("payment_recorded", language).format(
-            name=person.name, balance=_format_amount(balance)
-        )
+    recorded = await db.add_transaction_for_person(
+        person.id, stored_amount, description
+    )
+    if recorded is None:
+        return await _end_for_missing_person(update, context, language)
+
+    person, balance = recorded
+    notice = get_text("payment_recorded", language).format(
+        name=person.name, balance=_format_amount(balance)
     )
     LOGGER.info(
         "Payment recorded for person_id=%s amount=%s description=%s",
@@ -2072,7 +2364,7 @@ async def _complete_menu_payment(
         description,
     )
     clear_workflow(context)
-    await send_main_menu_reply(update, context, language)
+    await send_main_menu_reply(update, context, language, notice=notice)
     return ConversationHandler.END
 
 
@@ -2087,16 +2379,14 @@ async def receive_payment_description(
 async def skip_payment_description(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
     if update.callback_query:
-        await update.callback_query.answer()
-        if update.callback_query.message:
-            await update.callback_query.message.edit_reply_markup(reply_markup=None)
+        await _answer_and_clear_markup(update.callback_query)
     return await _complete_menu_payment(update, context, language, "")
 
 
 # ---- History ----
 async def start_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     clear_workflow(context)
-    context.user_data["flow"] = "history"
+    _begin_workflow(context, "history")
     context.user_data["person_state"] = HISTORY_PERSON
     context.user_data["person_next_state"] = HISTORY_DATES
     return await prompt_person_selection(update, context)
@@ -2122,7 +2412,7 @@ async def _load_history_datetimes(
     )
     if datetimes is not None:
         return datetimes
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     person: Person = context.user_data["person"]
     datetimes = await db.get_transaction_timestamps(person.id)
     context.user_data["history_available_datetimes"] = datetimes
@@ -2217,8 +2507,15 @@ def _history_pick_datetime(
     return candidates[0] if phase == "start" else candidates[-1]
 
 
-def _format_history_datetime(value: datetime) -> str:
-    return value.strftime("%Y-%m-%d %H:%M")
+def _format_history_range_summary(
+    language: str, start: datetime, end: datetime
+) -> str:
+    template = _HISTORY_RANGE_SUMMARY_TEMPLATES.get(
+        language, _HISTORY_RANGE_SUMMARY_TEMPLATES["en"]
+    )
+    return template.format(
+        start=_format_timestamp(start), end=_format_timestamp(end)
+    )
 
 
 async def _prompt_history_custom_level(
@@ -2267,9 +2564,8 @@ async def _prompt_history_custom_level(
     if not options:
         if phase == "end":
             selection.setdefault("end", {})["datetime"] = selection["start"]["datetime"]
-            summary = get_text("history_custom_range_summary", language).format(
-                start=_format_history_datetime(selection["start"]["datetime"]),
-                end=_format_history_datetime(selection["end"]["datetime"]),
+            summary = _format_history_range_summary(
+                language, selection["start"]["datetime"], selection["end"]["datetime"]
             )
             await query.message.edit_text(
                 with_cancel_hint(summary, language),
@@ -2288,15 +2584,39 @@ async def _prompt_history_custom_level(
     return HISTORY_DATES
 
 
+# Longer histories are formatted on a worker thread so the event loop stays
+# free for other chats.
+HISTORY_RENDER_THREAD_THRESHOLD = 500
+
+
+def format_history(
+    person: Person, history: Sequence[Transaction], language: str
+) -> str:
+    lines = [
+        get_text("history_header", language).format(name=_escape_html(person.name))
+    ]
+    debt_template = get_text("history_item_debt", language)
+    payment_template = get_text("history_item_payment", language)
+    lines.extend(
+        (payment_template if item.is_payment else debt_template).format(
+            amount=_format_amount(abs(item.amount)),
+            description=_escape_html(item.description) if item.description else "-",
+            date=_format_timestamp(item.created_at),
+        )
+        for item in history
+    )
+    return "\n".join(lines)
+
+
 async def _show_history(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
+    language: str,
     *,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
 ) -> int:
-    language = await get_language(context, update.effective_user.id)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     person: Person = context.user_data["person"]
     history = await db.get_history(
         person.id, start_date=start_date, end_date=end_date
@@ -2310,21 +2630,12 @@ async def _show_history(
         clear_workflow(context)
         return ConversationHandler.END
 
-    lines = [
-        get_text("history_header", language).format(name=escape(person.name))
-    ]
-    for item in history:
-        template = "history_item_payment" if item.is_payment else "history_item_debt"
-        description = escape(item.description) if item.description else "-"
-        lines.append(
-            get_text(template, language).format(
-                amount=_format_amount(abs(item.amount)),
-                description=description,
-                date=item.created_at.strftime("%Y-%m-%d %H:%M"),
-            )
-        )
+    if len(history) > HISTORY_RENDER_THREAD_THRESHOLD:
+        text = await asyncio.to_thread(format_history, person, history, language)
+    else:
+        text = format_history(person, history, language)
     await target.reply_text(
-        "\n".join(lines),
+        text,
         parse_mode=constants.ParseMode.HTML,
         reply_markup=history_back_to_menu_keyboard(language),
     )
@@ -2338,18 +2649,16 @@ async def fetch_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     if text.lower() != "/skip":
-        try:
-            start_str, end_str = [part.strip() for part in text.split(",", 1)]
-            start_date = datetime.fromisoformat(start_str)
-            end_date = datetime.fromisoformat(end_str)
-        except ValueError:
+        date_range = _parse_date_range(text)
+        if date_range is None:
             await update.message.reply_text(
-                with_cancel_hint(get_text("invalid_date_range", language), language),
+                _cancel_prompt("invalid_date_range", language),
                 reply_markup=cancel_keyboard(language),
             )
             return HISTORY_DATES
+        start_date, end_date = date_range
     return await _show_history(
-        update, context, start_date=start_date, end_date=end_date
+        update, context, language, start_date=start_date, end_date=end_date
     )
 
 
@@ -2369,19 +2678,19 @@ async def handle_history_range_selection(
 
     if choice == "skip":
         await query.message.edit_text(
-            with_cancel_hint(get_text("history_range_all_records", language), language),
+            _cancel_prompt("history_range_all_records", language),
             reply_markup=None,
         )
-        return await _show_history(update, context)
+        return await _show_history(update, context, language)
 
     if choice == "custom":
         datetimes = await _load_history_datetimes(context)
         if not datetimes:
             await query.message.edit_text(
-                with_cancel_hint(get_text("history_no_custom_data", language), language),
+                _cancel_prompt("history_no_custom_data", language),
                 reply_markup=None,
             )
-            return await _show_history(update, context)
+            return await _show_history(update, context, language)
         selection = _ensure_history_selection(context)
         selection["phase"] = "start"
         selection["start"] = {}
@@ -2419,7 +2728,7 @@ async def handle_history_range_selection(
         reply_markup=None,
     )
     return await _show_history(
-        update, context, start_date=start_date, end_date=end_date
+        update, context, language, start_date=start_date, end_date=end_date
     )
 
 
@@ -2470,17 +2779,14 @@ async def handle_history_custom_selection(
         available_years = _history_available_years(datetimes, min_dt=chosen_dt)
         if not available_years:
             selection.setdefault("end", {})["datetime"] = chosen_dt
-            summary = get_text("history_custom_range_summary", language).format(
-                start=_format_history_datetime(chosen_dt),
-                end=_format_history_datetime(chosen_dt),
-            )
+            summary = _format_history_range_summary(language, chosen_dt, chosen_dt)
             await query.message.edit_text(
                 with_cancel_hint(summary, language),
                 reply_markup=history_confirmation_keyboard(language),
             )
             return HISTORY_DATES
         start_text = get_text("history_custom_start_selected", language).format(
-            start=_format_history_datetime(chosen_dt)
+            start=_format_timestamp(chosen_dt)
         )
         await query.message.edit_text(
             with_cancel_hint(start_text, language),
@@ -2494,10 +2800,7 @@ async def handle_history_custom_selection(
     if start_dt and chosen_dt < start_dt:
         chosen_dt = start_dt
         phase_bucket["datetime"] = chosen_dt
-    summary = get_text("history_custom_range_summary", language).format(
-        start=_format_history_datetime(start_dt or chosen_dt),
-        end=_format_history_datetime(chosen_dt),
-    )
+    summary = _format_history_range_summary(language, start_dt or chosen_dt, chosen_dt)
     await query.message.edit_text(
         with_cancel_hint(summary, language),
         reply_markup=history_confirmation_keyboard(language),
@@ -2548,7 +2851,7 @@ async def handle_history_confirmation(
             reply_markup=None,
         )
         return await _show_history(
-            update, context, start_date=start_dt, end_date=end_dt
+            update, context, language, start_date=start_dt, end_date=end_dt
         )
 
     LOGGER.warning("Unknown history confirmation action: %s", action)
@@ -2561,13 +2864,12 @@ async def start_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     has_pending_workflow = context.user_data.get("person_next_state") is not None
     if not has_pending_workflow:
         context.user_data["person_state"] = SEARCH_QUERY
-    await answer_callback(update)
+        _begin_workflow(context)
+    answer_callback_soon(update, context)
     target = get_reply_target(update)
-    prompt = "\n".join(
-        [get_text("search_prompt", language), get_text("search_filters_hint", language)]
-    )
+    prompt = get_text("search_prompt", language)
     await target.reply_text(
-        with_cancel_hint(prompt, language),
+        f"{prompt}\n{_cancel_prompt('search_filters_hint', language)}",
         reply_markup=cancel_keyboard(language),
     )
     return SEARCH_QUERY
@@ -2575,83 +2877,86 @@ async def start_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
 async def search_people(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
-    db: Database = context.bot_data["db"]
+    db = _get_db(context)
     text = update.message.text.strip()
-    response = await db.search_people(text)
+    response = await db.search_people(text, limit=SEARCH_RESULTS_LIMIT)
+    hint = _cancel_prompt("search_filters_hint", language)
     if not response.matches:
         message = get_text("not_found", language)
         if response.suggestions:
             message = get_text("search_suggestions", language).format(
                 suggestions=", ".join(response.suggestions)
             )
-        await update.message.reply_text(message)
         await update.message.reply_text(
-            with_cancel_hint(get_text("search_filters_hint", language), language),
+            f"{message}\n\n{hint}",
             reply_markup=cancel_keyboard(language),
         )
         return SEARCH_QUERY
 
     formatted = format_search_results(language, response)
-    keyboard = search_results_keyboard(response.matches)
-    await update.message.reply_text(formatted, reply_markup=keyboard)
-    await update.message.reply_text(
-        with_cancel_hint(get_text("search_filters_hint", language), language),
-        reply_markup=cancel_keyboard(language),
-    )
+    keyboard = search_results_keyboard(response.matches, language)
+    await update.message.reply_text(f"{formatted}\n\n{hint}", reply_markup=keyboard)
     return SEARCH_QUERY
 
 
 # ---- Language ----
 async def start_language(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     language = await get_language(context, update.effective_user.id)
-    await answer_callback(update)
+    answer_callback_soon(update, context)
     target = get_reply_target(update)
     message = await target.reply_text(
-        with_cancel_hint(get_text("language_prompt", language), language),
+        _cancel_prompt("language_prompt", language),
         reply_markup=language_keyboard(language),
     )
+    context.user_data[_LANGUAGE_KEYBOARD_OPEN_KEY] = True
     _remember_prompt_message(update, context, getattr(message, "message_id", None))
     return LANGUAGE_SELECTION
 
 
 async def change_language(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    languages = available_languages()
+    languages = _LANGUAGES
     matched_code: Optional[str] = None
     if update.callback_query:
         query = update.callback_query
-        await query.answer()
-        payload = query.data.split(":", 1)[-1]
-        if payload in languages:
-            matched_code = payload
+        answer_callback_soon(update, context)
+        matched_code = _LANGUAGE_CALLBACKS.get(query.data)
         target = query.message
-        if matched_code:
+        # Rapid double taps deliver several callbacks for the same keyboard;
+        # only the first one needs to remove it.
+        if matched_code and context.user_data.pop(_LANGUAGE_KEYBOARD_OPEN_KEY, False):
             await query.message.edit_reply_markup(reply_markup=None)
     else:
-        requested = update.message.text.strip().casefold()
-        for code, label in languages.items():
-            if requested == code.casefold() or requested == label.casefold():
-                matched_code = code
-                break
+        requested = update.message.text.strip()
+        if len(requested) <= _LANGUAGE_LOOKUP_MAX_LENGTH:
+            matched_code = _LANGUAGE_LOOKUP.get(requested.casefold())
         target = update.message
 
     if not matched_code:
         language = await get_language(context, update.effective_user.id)
         message = await target.reply_text(
-            with_cancel_hint(get_text("language_prompt_codes", language), language),
+            _cancel_prompt("language_prompt_codes", language),
             reply_markup=language_keyboard(language),
         )
+        context.user_data[_LANGUAGE_KEYBOARD_OPEN_KEY] = True
         _remember_prompt_message(update, context, getattr(message, "message_id", None))
         return LANGUAGE_SELECTION
 
-    db: Database = context.bot_data["db"]
-    await db.set_user_language(update.effective_user.id, matched_code)
+    user_id = update.effective_user.id
     context.user_data["language"] = matched_code
-    label = languages[matched_code]
-    await target.reply_text(
-        get_text("language_updated", matched_code).format(language=label),
+    # user_data already serves the new language, so the durable write can
+    # overlap with the replies. PTB reports failures and awaits it on stop.
+    db = _get_db(context)
+    context.application.create_task(
+        db.set_user_language(user_id, matched_code), update=update
     )
+    label = languages[matched_code]
     clear_workflow(context)
-    await send_main_menu_reply(update, context, matched_code)
+    await send_main_menu_reply(
+        update,
+        context,
+        matched_code,
+        notice=get_text("language_updated", matched_code).format(language=label),
+    )
     return ConversationHandler.END
 
 
@@ -2662,398 +2967,364 @@ async def unknown(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await send_start_message(update, context)
 
 
-def build_application(config) -> Application:
-    builder = ApplicationBuilder().token(config.token)
+def _probe_rate_limiter() -> Tuple[Optional[AIORateLimiter], Optional[RuntimeError]]:
+    """Build the optional rate limiter, returning the error if its extras are missing."""
+
     try:
-        rate_limiter = AIORateLimiter()
-    except RuntimeError as exc:  # pragma: no cover - depends on optional extras
-        LOGGER.warning("Rate limiter disabled: %s", exc)
-    else:
-        builder = builder.rate_limiter(rate_limiter)
+        return AIORateLimiter(), None
+    except RuntimeError as exc:
+        return None, exc
+
+
+# Probed once at import so each process boot does not re-check optional extras.
+_RATE_LIMITER, _RATE_LIMITER_ERROR = _probe_rate_limiter()
+
+
+# Long-poll duration for getUpdates, in seconds. PTB adds it to the read
+# timeout of the polling request itself.
+POLLING_TIMEOUT = 30
+WEBHOOK_MAX_CONNECTIONS = 100
+
+
+def build_application(config) -> Application:
+    # Outgoing Bot API calls share one HTTP connection pool. It is sized to
+    # match the number of updates processed at once, and callers wait for a
+    # free connection instead of failing after PTB's one-second default.
+    builder = (
+        ApplicationBuilder()
+        .token(config.token)
+        .connection_pool_size(config.connection_pool_size)
+        .pool_timeout(config.pool_timeout)
+        .connect_timeout(config.connect_timeout)
+        .read_timeout(config.read_timeout)
+        .get_updates_pool_timeout(config.pool_timeout)
+    )
+    if _RATE_LIMITER is None:
+        LOGGER.warning(
+            "Group rate limiting and flood retries disabled: %s", _RATE_LIMITER_ERROR
+        )
+    builder = builder.rate_limiter(ChatRateLimiter(_RATE_LIMITER))
+    builder = builder.concurrent_updates(
+        ChatUpdateProcessor(max_concurrent_updates=config.connection_pool_size)
+    )
     application = builder.build()
     return application
 
 
-def register_handlers(application: Application) -> None:
-    application.add_handler(CommandHandler("start", start))
-    application.add_handler(CommandHandler("help", show_help))
-    application.add_handler(CommandHandler("dashboard", show_dashboard))
-    application.add_handler(CommandHandler("people", show_people_list))
-    application.add_handler(CallbackQueryHandler(show_dashboard, pattern="^menu:dashboard$"))
-    application.add_handler(
-        CallbackQueryHandler(
-            show_people_list, pattern="^(?:menu:list_people|management:contacts:list)$"
-        )
-    )
-    application.add_handler(
-        CallbackQueryHandler(show_management_menu, pattern="^menu:management$")
-    )
-    application.add_handler(
-        CallbackQueryHandler(show_management_menu, pattern="^management:menu$")
-    )
-    application.add_handler(
-        CallbackQueryHandler(
-            show_contact_management_menu, pattern="^management:contacts$"
-        )
-    )
-    application.add_handler(
-        CallbackQueryHandler(
-            show_description_management_menu, pattern="^management:descriptions$"
-        )
-    )
-    application.add_handler(
-        CallbackQueryHandler(
-            show_database_management_menu, pattern="^management:database$"
-        )
+# New plain-text messages that are not commands. Edits are excluded: the
+# workflow handlers read ``update.message``, which is ``None`` for them.
+TEXT_MESSAGE_FILTER = filters.UpdateType.MESSAGE & filters.TEXT & ~filters.COMMAND
+
+CANCEL_CALLBACK_PATTERN = re.compile(r"^workflow:cancel$", re.ASCII)
+SELECT_PERSON_CALLBACK_PATTERN = re.compile(r"^select_person:", re.ASCII)
+# The language picker opens from the main menu and the management menu.
+LANGUAGE_ENTRY_CALLBACK_PATTERN = re.compile(
+    r"^(?:menu|management):language$", re.ASCII
+)
+
+_CANCEL_CALLBACK_HANDLER = CallbackQueryHandler(cancel, pattern=CANCEL_CALLBACK_PATTERN)
+
+COMMON_FALLBACKS = _wrap_handlers(
+    (
+        CommandHandler("cancel", cancel),
+        _CANCEL_CALLBACK_HANDLER,
     )
-    application.add_handler(
+)
+
+# Handlers shared by every state that lets the user pick a contact either by
+# ID or from the paginated menu.
+PERSON_MENU_HANDLERS = _wrap_handlers(
+    (
+        CallbackQueryHandler(handle_selection_method, pattern="^method:"),
+        CallbackQueryHandler(handle_person_menu_navigation, pattern="^person_page:"),
+        CallbackQueryHandler(handle_person_menu_search, pattern="^person_search"),
         CallbackQueryHandler(
-            handle_database_backup, pattern="^management:database:backup$"
-        )
-    )
-    application.add_handler(
-        CallbackQueryHandler(handle_database_zip, pattern="^management:database:zip$")
+            handle_person_selection, pattern=SELECT_PERSON_CALLBACK_PATTERN
+        ),
+        _CANCEL_CALLBACK_HANDLER,
     )
-    application.add_handler(CallbackQueryHandler(go_back_to_main_menu, pattern="^menu:back_to_main$"))
+)
+
+# The contact-picking state shared by the export, manage and history
+# conversations: a typed ``#ID`` or a pick from the menu.
+_PERSON_REFERENCE_HANDLER = _CallbackHandlerWrapper(
+    MessageHandler(TEXT_MESSAGE_FILTER, receive_person_reference)
+)
+PERSON_REFERENCE_HANDLERS = (_PERSON_REFERENCE_HANDLER, *PERSON_MENU_HANDLERS)
+
+
+def _transaction_conversation(
+    name: str,
+    *,
+    entry_points: Iterable[BaseHandler[Update, ContextTypes.DEFAULT_TYPE]],
+    states: Tuple[int, int, int],
+    receive_entry: Callable[..., Awaitable[int]],
+    receive_amount: Callable[..., Awaitable[int]],
+    receive_description: Callable[..., Awaitable[int]],
+    skip_description: Callable[..., Awaitable[int]],
+    skip_pattern: str,
+) -> ConversationHandler:
+    """Build the contact, amount, description conversation for debts and payments."""
+
+    entry_state, amount_state, description_state = states
+    return ConversationHandler(
+        entry_points=_wrap_handlers(entry_points),
+        states={
+            entry_state: _wrap_handlers(
+                (
+                    MessageHandler(TEXT_MESSAGE_FILTER, receive_entry),
+                    *PERSON_MENU_HANDLERS,
+                )
+            ),
+            amount_state: _wrap_handlers(
+                (
+                    MessageHandler(TEXT_MESSAGE_FILTER, receive_amount),
+                    _CANCEL_CALLBACK_HANDLER,
+                )
+            ),
+            description_state: _wrap_handlers(
+                (
+                    MessageHandler(TEXT_MESSAGE_FILTER, receive_description),
+                    CommandHandler("skip", skip_description),
+                    CallbackQueryHandler(skip_description, pattern=skip_pattern),
+                    _CANCEL_CALLBACK_HANDLER,
+                )
+            ),
+        },
+        fallbacks=COMMON_FALLBACKS,
+        name=name,
+    )
+
+
+# Callback data that opens a screen directly rather than a conversation. One
+# handler matches them all with a single regex and dispatches by exact data.
+_CALLBACK_ROUTES = {
+    "menu:dashboard": show_dashboard,
+    "menu:list_people": show_people_list,
+    "menu:management": show_management_menu,
+    "menu:back_to_main": go_back_to_main_menu,
+    "management:menu": show_management_menu,
+    "management:contacts": show_contact_management_menu,
+    "management:contacts:list": show_people_list,
+    "management:descriptions": show_description_management_menu,
+    "management:database": show_database_management_menu,
+    "management:database:backup": handle_database_backup,
+    "management:database:zip": handle_database_zip,
+}
+CALLBACK_ROUTE_PATTERN = re.compile(
+    rf"^(?:{'|'.join(map(re.escape, _CALLBACK_ROUTES))})$", re.ASCII
+)
+
+
+async def route_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await _CALLBACK_ROUTES[update.callback_query.data](update, context)
+
+
+# Stateless handlers registered ahead of the conversations. Conversation
+# handlers track per-chat state, so they are still built per application.
+# The read-only reports do not block, so a long list or a slow summary does
+# not hold up the chat's next update.
+MENU_HANDLERS = (
+    CommandHandler("start", start),
+    CommandHandler("help", show_help),
+    CommandHandler("dashboard", show_dashboard, block=False),
+    CommandHandler("people", show_people_list, block=False),
+    CallbackQueryHandler(route_callback, pattern=CALLBACK_ROUTE_PATTERN),
+)
+
+# Catch-all handlers registered after every conversation.
+FALLBACK_HANDLERS = (
+    CallbackQueryHandler(send_start_message, pattern=MENU_CALLBACK_FALLBACK_PATTERN),
+    # Commands are text messages too, so one handler covers both.
+    MessageHandler(filters.TEXT, unknown),
+)
+
+
+def register_handlers(application: Application) -> None:
+    for handler in MENU_HANDLERS:
+        application.add_handler(handler)
 
+    skip_export_handler = CommandHandler("skip", skip_export_contacts)
     export_conv = ConversationHandler(
         entry_points=_wrap_handlers(
-            [
+            (
                 CommandHandler("export", start_export_transactions),
                 CallbackQueryHandler(start_export_transactions, pattern="^menu:export$"),
-            ]
+            )
         ),
         states={
             EXPORT_MODE: _wrap_handlers(
-                [
+                (
                     CallbackQueryHandler(handle_export_mode, pattern="^export:mode:"),
-                    CommandHandler("skip", skip_export_contacts),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    skip_export_handler,
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
             EXPORT_CONTACT_CHOICE: _wrap_handlers(
-                [
+                (
                     CallbackQueryHandler(
                         handle_export_contact_choice, pattern="^export:contacts:"
                     ),
-                    CommandHandler("skip", skip_export_contacts),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    skip_export_handler,
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
-            EXPORT_PERSON: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_person_reference
-                    ),
-                    CommandHandler("skip", skip_export_contacts),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+            EXPORT_PERSON: (
+                _PERSON_REFERENCE_HANDLER,
+                _CallbackHandlerWrapper(skip_export_handler),
+                *PERSON_MENU_HANDLERS,
             ),
         },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
+        fallbacks=COMMON_FALLBACKS,
         name="export",
     )
     application.add_handler(export_conv)
 
+    manage_person_action_handlers = _wrap_handlers(
+        (
+            CallbackQueryHandler(handle_manage_person_action, pattern="^person_manage:"),
+            _CANCEL_CALLBACK_HANDLER,
+        )
+    )
     manage_person_conv = ConversationHandler(
         entry_points=_wrap_handlers(
-            [
+            (
                 CommandHandler("manage_contact", start_manage_person),
                 CallbackQueryHandler(start_manage_person, pattern="^menu:manage_person$"),
                 CallbackQueryHandler(start_contact_edit, pattern="^management:contacts:edit$"),
                 CallbackQueryHandler(start_contact_delete, pattern="^management:contacts:delete$"),
-            ]
+            )
         ),
         states={
-            MANAGE_PERSON_SELECT: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_person_reference
-                    ),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-            MANAGE_PERSON_ACTION: _wrap_handlers(
-                [
-                    CallbackQueryHandler(
-                        handle_manage_person_action, pattern="^person_manage:"
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
+            MANAGE_PERSON_SELECT: PERSON_REFERENCE_HANDLERS,
+            MANAGE_PERSON_ACTION: manage_person_action_handlers,
             MANAGE_PERSON_RENAME: _wrap_handlers(
-                [
+                (
                     MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_person_rename
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-            MANAGE_PERSON_CONFIRM_DELETE: _wrap_handlers(
-                [
-                    CallbackQueryHandler(
-                        handle_manage_person_action, pattern="^person_manage:"
+                        TEXT_MESSAGE_FILTER, receive_person_rename
                     ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
+            MANAGE_PERSON_CONFIRM_DELETE: manage_person_action_handlers,
         },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
+        fallbacks=COMMON_FALLBACKS,
         name="manage_person",
     )
     application.add_handler(manage_person_conv)
 
     manage_description_conv = ConversationHandler(
         entry_points=_wrap_handlers(
-            [
+            (
                 CallbackQueryHandler(
                     start_description_edit, pattern="^management:descriptions:edit$"
                 ),
                 CallbackQueryHandler(
                     start_description_delete, pattern="^management:descriptions:delete$"
                 ),
-            ]
+            )
         ),
         states={
-            MANAGE_DESCRIPTION_SELECT: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_person_reference
-                    ),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
+            MANAGE_DESCRIPTION_SELECT: PERSON_REFERENCE_HANDLERS,
             MANAGE_DESCRIPTION_CHOOSE: _wrap_handlers(
-                [
+                (
                     CallbackQueryHandler(
                         handle_description_choice,
                         pattern="^description:(?:select|back_contact)",
                     ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
             MANAGE_DESCRIPTION_EDIT: _wrap_handlers(
-                [
+                (
                     MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_description_edit
+                        TEXT_MESSAGE_FILTER, receive_description_edit
                     ),
                     CallbackQueryHandler(
                         handle_description_back_to_list, pattern="^description:back_list$"
                     ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
             MANAGE_DESCRIPTION_CONFIRM_DELETE: _wrap_handlers(
-                [
+                (
                     CallbackQueryHandler(
                         handle_description_delete_confirmation,
                         pattern="^description:delete:",
                     ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
         },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
+        fallbacks=COMMON_FALLBACKS,
         name="manage_description",
     )
     application.add_handler(manage_description_conv)
 
     add_person_conv = ConversationHandler(
         entry_points=_wrap_handlers(
-            [
+            (
                 CommandHandler("add_person", prompt_person_name),
                 CallbackQueryHandler(prompt_person_name, pattern="^menu:add_person$"),
-            ]
+            )
         ),
         states={
             ADD_PERSON_NAME: _wrap_handlers(
-                [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, save_person_name),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                (
+                    MessageHandler(TEXT_MESSAGE_FILTER, save_person_name),
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
         },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
+        fallbacks=COMMON_FALLBACKS,
         name="add_person",
         persistent=False,
     )
     application.add_handler(add_person_conv)
 
-    add_debt_conv = ConversationHandler(
-        entry_points=_wrap_handlers(
-            [
+    application.add_handler(
+        _transaction_conversation(
+            "add_debt",
+            entry_points=(
                 CommandHandler("add_debt", start_add_debt),
                 CallbackQueryHandler(start_add_debt, pattern="^menu:add_debt$"),
-            ]
-        ),
-        states={
-            DEBT_ENTRY: _wrap_handlers(
-                [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, receive_debt_entry),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-            DEBT_AMOUNT: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_debt_amount
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-            DEBT_DESCRIPTION: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_debt_description
-                    ),
-                    CommandHandler("skip", skip_debt_description),
-                    CallbackQueryHandler(
-                        skip_debt_description, pattern="^skip:debt_description$"
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
             ),
-        },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
-        name="add_debt",
+            states=(DEBT_ENTRY, DEBT_AMOUNT, DEBT_DESCRIPTION),
+            receive_entry=receive_debt_entry,
+            receive_amount=receive_debt_amount,
+            receive_description=receive_debt_description,
+            skip_description=skip_debt_description,
+            skip_pattern="^skip:debt_description$",
+        )
     )
-    application.add_handler(add_debt_conv)
-
-    payment_conv = ConversationHandler(
-        entry_points=_wrap_handlers(
-            [
+    application.add_handler(
+        _transaction_conversation(
+            "payment",
+            entry_points=(
                 CommandHandler("record_payment", start_payment),
                 CallbackQueryHandler(start_payment, pattern="^menu:pay_debt$"),
-            ]
-        ),
-        states={
-            PAYMENT_ENTRY: _wrap_handlers(
-                [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, receive_payment_entry),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
             ),
-            PAYMENT_AMOUNT: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_payment_amount
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-            PAYMENT_DESCRIPTION: _wrap_handlers(
-                [
-                    MessageHandler(
-                        filters.TEXT & ~filters.COMMAND, receive_payment_description
-                    ),
-                    CommandHandler("skip", skip_payment_description),
-                    CallbackQueryHandler(
-                        skip_payment_description, pattern="^skip:payment_description$"
-                    ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
-        },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
-        name="payment",
+            states=(PAYMENT_ENTRY, PAYMENT_AMOUNT, PAYMENT_DESCRIPTION),
+            receive_entry=receive_payment_entry,
+            receive_amount=receive_payment_amount,
+            receive_description=receive_payment_description,
+            skip_description=skip_payment_description,
+            skip_pattern="^skip:payment_description$",
+        )
     )
-    application.add_handler(payment_conv)
 
     history_conv = ConversationHandler(
         entry_points=_wrap_handlers(
-            [
+            (
                 CommandHandler("history", start_history),
                 CallbackQueryHandler(start_history, pattern="^menu:history$"),
-            ]
+            )
         ),
         states={
-            HISTORY_PERSON: _wrap_handlers(
-                [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, receive_person_reference),
-                    CallbackQueryHandler(handle_selection_method, pattern="^method:"),
-                    CallbackQueryHandler(
-                        handle_person_menu_navigation, pattern="^person_page:"
-                    ),
-                    CallbackQueryHandler(
-                        handle_person_menu_search, pattern="^person_search"
-                    ),
-                    CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
+            HISTORY_PERSON: PERSON_REFERENCE_HANDLERS,
             HISTORY_DATES: _wrap_handlers(
-                [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, fetch_history),
+                (
+                    MessageHandler(TEXT_MESSAGE_FILTER, fetch_history),
                     CommandHandler("skip", fetch_history),
                     CallbackQueryHandler(
                         handle_history_range_selection, pattern="^history:range:"
@@ -3064,42 +3335,31 @@ def register_handlers(application: Application) -> None:
                     CallbackQueryHandler(
                         handle_history_confirmation, pattern="^history:confirm:"
                     ),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
+                    _CANCEL_CALLBACK_HANDLER,
+                )
             ),
         },
-        fallbacks=_wrap_handlers(
-            [
-                CommandHandler("cancel", cancel),
-                CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-            ]
-        ),
+        fallbacks=COMMON_FALLBACKS,
         name="history",
     )
     application.add_handler(history_conv)
 
     application.add_handler(
         ConversationHandler(
-            entry_points=_wrap_handlers(
-                [
-                    CommandHandler("search", start_search),
-                ]
-            ),
+            entry_points=_wrap_handlers((CommandHandler("search", start_search),)),
             states={
                 SEARCH_QUERY: _wrap_handlers(
-                    [
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, search_people),
-                        CallbackQueryHandler(handle_person_selection, pattern="^select_person:"),
-                        CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                    ]
+                    (
+                        MessageHandler(TEXT_MESSAGE_FILTER, search_people),
+                        CallbackQueryHandler(
+                            handle_person_selection,
+                            pattern=SELECT_PERSON_CALLBACK_PATTERN,
+                        ),
+                        _CANCEL_CALLBACK_HANDLER,
+                    )
                 ),
             },
-            fallbacks=_wrap_handlers(
-                [
-                    CommandHandler("cancel", cancel),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
+            fallbacks=COMMON_FALLBACKS,
             name="search",
         )
     )
@@ -3107,79 +3367,139 @@ def register_handlers(application: Application) -> None:
     application.add_handler(
         ConversationHandler(
             entry_points=_wrap_handlers(
-                [
+                (
                     CommandHandler("language", start_language),
-                    CallbackQueryHandler(start_language, pattern="^menu:language$"),
-                    CallbackQueryHandler(start_language, pattern="^management:language$"),
-                ]
+                    CallbackQueryHandler(
+                        start_language, pattern=LANGUAGE_ENTRY_CALLBACK_PATTERN
+                    ),
+                )
             ),
             states={
                 LANGUAGE_SELECTION: _wrap_handlers(
-                    [
+                    (
                         CallbackQueryHandler(change_language, pattern="^lang:"),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, change_language),
-                        CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                    ]
+                        MessageHandler(TEXT_MESSAGE_FILTER, change_language),
+                        _CANCEL_CALLBACK_HANDLER,
+                    )
                 )
             },
-            fallbacks=_wrap_handlers(
-                [
-                    CommandHandler("cancel", cancel),
-                    CallbackQueryHandler(cancel, pattern="^workflow:cancel$"),
-                ]
-            ),
+            fallbacks=COMMON_FALLBACKS,
             name="language",
         )
     )
 
-    application.add_handler(
-        CallbackQueryHandler(
-            send_start_message, pattern=MENU_CALLBACK_FALLBACK_PATTERN
-        )
-    )
-    application.add_handler(MessageHandler(filters.COMMAND, unknown))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, unknown))
+    for handler in FALLBACK_HANDLERS:
+        application.add_handler(handler)
 
 
-async def main() -> None:
-    config = load_config()
+def _configure_logging(config) -> QueueListener:
+    """Route log records through a queue drained by a background thread.
+
+    Handlers only enqueue records, so file and console writes never block
+    the event loop. The caller must stop the returned listener to flush it.
+    """
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[logging.FileHandler(config.log_file), logging.StreamHandler()],
+        handlers=[QueueHandler(log_queue)],
+    )
+    listener = QueueListener(
+        log_queue,
+        logging.FileHandler(config.log_file),
+        logging.StreamHandler(),
+        respect_handler_level=True,
     )
+    listener.start()
+    return listener
+
+
+async def main() -> None:
+    config = load_config()
+    listener = _configure_logging(config)
+    try:
+        await _run_bot(config)
+    finally:
+        listener.stop()
+
+
+async def _run_bot(config) -> None:
+    preload_texts()
+    for language in _LANGUAGES:
+        compose_start_message(language)
+        main_menu_keyboard(language)
     db = Database(config.database_path, backup_config=config.backup)
-    await db.initialize()
     application = build_application(config)
-    application.bot_data["db"] = db
+    application.bot_data[DB_KEY] = db
     register_handlers(application)
-    await application.initialize()
+    # The schema set-up and the Bot API handshake (getMe) are independent, so
+    # they run concurrently; nothing reads the database before start().
+    db_result, app_result = await asyncio.gather(
+        db.initialize(), application.initialize(), return_exceptions=True
+    )
+    if isinstance(db_result, BaseException) or isinstance(app_result, BaseException):
+        if not isinstance(app_result, BaseException):
+            await application.shutdown()
+        await db.close()
+        raise db_result if isinstance(db_result, BaseException) else app_result
     await application.start()
     LOGGER.info("Bot started")
-    await application.updater.start_polling()
+    if config.webhook_url:
+        # Telegram pushes updates over up to WEBHOOK_MAX_CONNECTIONS parallel
+        # requests instead of batching them into one getUpdates response.
+        await application.updater.start_webhook(
+            listen=config.webhook_listen,
+            port=config.webhook_port,
+            url_path=config.token,
+            webhook_url=f"{config.webhook_url}/{config.token}",
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            drop_pending_updates=False,
+        )
+    else:
+        await application.updater.start_polling(
+            timeout=POLLING_TIMEOUT, drop_pending_updates=False
+        )
 
-    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    stop_future: asyncio.Future[None] = loop.create_future()
 
     def _signal_handler() -> None:
-        stop_event.set()
+        if not stop_future.done():
+            stop_future.set_result(None)
 
-    loop = asyncio.get_running_loop()
-    try:
-        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGABRT):
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGABRT):
+        try:
             loop.add_signal_handler(sig, _signal_handler)
-    except NotImplementedError:
-        LOGGER.warning("Signal handlers are not supported on this platform")
+        except NotImplementedError:
+            # Windows event loops cannot watch signals; a plain handler that
+            # hops back onto the loop still gives a clean shutdown there.
+            signal.signal(
+                sig, lambda *_: loop.call_soon_threadsafe(_signal_handler)
+            )
 
     try:
-        await stop_event.wait()
-    except (KeyboardInterrupt, SystemExit):
-        LOGGER.info("Shutdown requested by user")
+        await stop_future
+        LOGGER.info("Shutdown requested")
     finally:
         if application.updater.running:
             await application.updater.stop()
         await application.stop()
         await application.shutdown()
+        await db.wait_for_pending_tasks()
+        await db.close()
+
+
+def run() -> None:
+    """Run :func:`main` on uvloop when it is installed, else the default loop."""
+
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -17,6 +17,13 @@ class BotConfig:
     database_path: str = "accounting.db"
     log_file: str = "accounting_bot.log"
     backup: DatabaseBackupConfig = field(default_factory=DatabaseBackupConfig)
+    webhook_url: Optional[str] = None
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    connection_pool_size: int = 256
+    pool_timeout: float = 20.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 20.0
 
     @classmethod
     def from_env(cls) -> "BotConfig":
@@ -37,11 +44,23 @@ class BotConfig:
                 default=30,
             ),
         )
+        webhook_url = os.getenv("WEBHOOK_URL", "").strip().rstrip("/") or None
         return cls(
             token=token,
             database_path=db_path,
             log_file=log_file,
             backup=backup,
+            webhook_url=webhook_url,
+            webhook_listen=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"),
+            webhook_port=_parse_positive_int(os.getenv("WEBHOOK_PORT"), 8443),
+            connection_pool_size=_parse_positive_int(
+                os.getenv("HTTP_POOL_SIZE"), 256
+            ),
+            pool_timeout=_parse_positive_float(os.getenv("HTTP_POOL_TIMEOUT"), 20.0),
+            connect_timeout=_parse_positive_float(
+                os.getenv("HTTP_CONNECT_TIMEOUT"), 10.0
+            ),
+            read_timeout=_parse_positive_float(os.getenv("HTTP_READ_TIMEOUT"), 20.0),
         )
 
 
@@ -70,3 +89,27 @@ def _parse_optional_positive_int(value: Optional[str], *, default: Optional[int]
     if parsed <= 0:
         return None
     return parsed
+
+
+def _parse_positive_int(value: Optional[str], default: int) -> int:
+    if value is None or value.strip() == "":
+        return default
+    try:
+        parsed = int(value)
+    except ValueError as exc:  # pragma: no cover - validation guard
+        raise ValueError(f"Invalid integer value: {value!r}") from exc
+    if parsed <= 0:
+        raise ValueError(f"Value must be positive: {value!r}")
+    return parsed
+
+
+def _parse_positive_float(value: Optional[str], default: float) -> float:
+    if value is None or value.strip() == "":
+        return default
+    try:
+        parsed = float(value)
+    except ValueError as exc:  # pragma: no cover - validation guard
+        raise ValueError(f"Invalid number value: {value!r}") from exc
+    if parsed <= 0:
+        raise ValueError(f"Value must be positive: {value!r}")
+    return parsed
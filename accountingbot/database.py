@@ -2,21 +2,31 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import os
 import re
 import sqlite3
+import tempfile
 import unicodedata
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from .cache import LRUCache
+
 LOGGER = logging.getLogger(__name__)
 
+HISTORY_CACHE_SIZE = 1024
+HISTORY_CACHE_TTL = 30.0
+
+_HistoryKey = Tuple[int, int, Optional[datetime], Optional[datetime]]
+
 
 @dataclass(slots=True)
 class DatabaseBackupConfig:
@@ -132,6 +142,22 @@ class PersonAlreadyExistsError(ValueError):
     """Raised when trying to create a person with a duplicate name."""
 
 
+def _insert_transaction_and_sum(
+    conn: sqlite3.Connection, person_id: int, amount: int, description: str
+) -> int:
+    """Insert a transaction and return the person's balance, without committing."""
+
+    conn.execute(
+        "INSERT INTO transactions (person_id, amount, description) VALUES (?, ?, ?)",
+        (person_id, amount, description.strip()),
+    )
+    row = conn.execute(
+        "SELECT COALESCE(SUM(amount), 0) AS balance FROM transactions WHERE person_id = ?",
+        (person_id,),
+    ).fetchone()
+    return _to_int(row["balance"] if row else 0)
+
+
 class Database:
     """Async wrapper around SQLite for bot operations."""
 
@@ -139,11 +165,22 @@ class Database:
         self,
         db_path: str | os.PathLike[str] = "accounting.db",
         backup_config: Optional[DatabaseBackupConfig] = None,
+        *,
+        pool_size: int = 8,
     ) -> None:
         self.db_path = Path(db_path)
         self._lock = asyncio.Lock()
+        self._pool_size = pool_size
+        self._idle_connections: deque[sqlite3.Connection] = deque()
         self._backup_config = backup_config or DatabaseBackupConfig()
         self._background_tasks: set[asyncio.Task[None]] = set()
+        # Recent get_history results. Keys carry a per-person generation that
+        # every write to that person's transactions bumps, so stale entries
+        # (including ones stored by a read that raced the write) are never hit.
+        self._history_cache: LRUCache[_HistoryKey, Tuple[Transaction, ...]] = LRUCache(
+            HISTORY_CACHE_SIZE, ttl=HISTORY_CACHE_TTL
+        )
+        self._history_generations: Dict[int, int] = {}
 
     async def initialize(self) -> None:
         """Initialize the database schema."""
@@ -190,15 +227,61 @@ class Database:
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA busy_timeout = 5000;")
         conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA mmap_size = 134217728;")
 
     @asynccontextmanager
     async def _connection(self) -> AsyncIterator[sqlite3.Connection]:
         async with self._lock:
-            conn = await asyncio.to_thread(self._connect)
-            try:
+            async with self._pooled_connection() as conn:
                 yield conn
-            finally:
-                await asyncio.to_thread(conn.close)
+
+    @asynccontextmanager
+    async def _read_connection(self) -> AsyncIterator[sqlite3.Connection]:
+        """Open a connection for read-only queries without taking the write lock.
+
+        WAL journaling lets readers run alongside each other and alongside a
+        writer, so independent SELECTs can be issued concurrently.
+        """
+
+        async with self._pooled_connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def _pooled_connection(self) -> AsyncIterator[sqlite3.Connection]:
+        """Borrow an idle connection, opening a new one when none is free.
+
+        Connections go back to the pool with no open transaction; anything
+        left uncommitted by the caller is rolled back.
+        """
+
+        try:
+            conn = self._idle_connections.pop()
+        except IndexError:
+            conn = await asyncio.to_thread(self._connect)
+        try:
+            yield conn
+        finally:
+            await self._release_connection(conn)
+
+    async def _release_connection(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                await asyncio.to_thread(conn.rollback)
+        except sqlite3.Error:
+            LOGGER.exception("Failed to reset pooled database connection")
+            await asyncio.to_thread(conn.close)
+            return
+        if len(self._idle_connections) < self._pool_size:
+            self._idle_connections.append(conn)
+        else:
+            await asyncio.to_thread(conn.close)
+
+    async def close(self) -> None:
+        """Close every idle pooled connection."""
+
+        while self._idle_connections:
+            conn = self._idle_connections.pop()
+            await asyncio.to_thread(conn.close)
 
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, check_same_thread=False)
@@ -264,7 +347,9 @@ class Database:
             created_at=datetime.fromisoformat(result["created_at"]),
         )
 
-    async def search_people(self, query: str, limit: int = 25) -> SearchResponse:
+    async def search_people(
+        self, query: str, limit: int = 25, *, fetch_limit: int = 100
+    ) -> SearchResponse:
         """Search for people using fuzzy matching and optional filters.
 
         The query accepts special tokens:
@@ -273,6 +358,9 @@ class Database:
         - ``debtors`` (alias for ``balance>0``)
         - ``creditors`` (alias for ``balance<0``)
 
+        Up to ``fetch_limit`` candidates are scored, independent of how many
+        matches (``limit``) are returned.
+
         Returns a :class:`SearchResponse` containing scored matches and
         optional suggestions.
         """
@@ -312,7 +400,7 @@ class Database:
                 continue
             keywords.append(normalized)
 
-        fetch_limit = max(limit * 4, 50)
+        fetch_limit = max(fetch_limit, limit)
 
         sql = [
             "SELECT p.id, p.name, p.created_at, COALESCE(SUM(t.amount), 0) AS balance",
@@ -358,16 +446,18 @@ class Database:
         sql.append("LIMIT ?")
         params.append(fetch_limit)
 
-        async with self._connection() as conn:
-            cursor = await asyncio.to_thread(
-                conn.execute, " ".join(sql), tuple(params)
-            )
-            rows = await asyncio.to_thread(cursor.fetchall)
+        norm_query = _normalize_text(" ".join(keywords) if keywords else query)
+
+        def _run_search(
+            conn: sqlite3.Connection,
+        ) -> Tuple[List[SearchResult], List[str]]:
+            # Scoring is CPU-bound, so it runs on the worker thread with the
+            # query instead of on the event loop.
+            rows = conn.execute(" ".join(sql), tuple(params)).fetchall()
 
             matches: List[SearchResult] = []
             suggestions: List[str] = []
 
-            norm_query = _normalize_text(" ".join(keywords) if keywords else query)
             for row in rows:
                 person = Person(
                     id=row["id"],
@@ -398,22 +488,23 @@ class Database:
                     )
                 )
 
-            matches.sort(
+            # Only the best ``limit`` matches are returned, so select them
+            # without sorting every candidate.
+            matches = heapq.nsmallest(
+                limit,
+                matches,
                 key=lambda item: (
                     -item.score,
                     -abs(item.balance),
                     item.person.name.casefold(),
-                )
+                ),
             )
-            matches = matches[:limit]
 
             if not matches and keywords:
-                suggest_cursor = await asyncio.to_thread(
-                    conn.execute,
+                suggest_rows = conn.execute(
                     "SELECT name FROM people ORDER BY created_at DESC LIMIT ?",
                     (200,),
-                )
-                suggest_rows = await asyncio.to_thread(suggest_cursor.fetchall)
+                ).fetchall()
                 scored_suggestions: List[Tuple[float, str]] = []
                 for suggestion_row in suggest_rows:
                     suggestion_name = suggestion_row["name"]
@@ -424,6 +515,10 @@ class Database:
                         scored_suggestions.append((ratio, suggestion_name))
                 scored_suggestions.sort(key=lambda item: item[0], reverse=True)
                 suggestions = [name for _, name in scored_suggestions[:5]]
+            return matches, suggestions
+
+        async with self._read_connection() as conn:
+            matches, suggestions = await asyncio.to_thread(_run_search, conn)
 
         return SearchResponse(query=query, matches=matches, suggestions=suggestions)
 
@@ -518,6 +613,7 @@ class Database:
             )
             await asyncio.to_thread(conn.commit)
             transaction_id = cursor.lastrowid
+        self._invalidate_history(person_id)
         self._schedule_backup()
         LOGGER.info(
             "Added transaction for person_id=%s amount=%s description=%s",
@@ -527,6 +623,74 @@ class Database:
         )
         return await self.get_transaction(transaction_id)
 
+    async def add_transaction_returning_balance(
+        self, person_id: int, amount: int, description: str = ""
+    ) -> int:
+        """Insert a transaction and return the person's updated balance.
+
+        Both statements run on the same connection so callers that only need
+        the new balance avoid a second round-trip.
+        """
+
+        def _insert_and_sum(conn: sqlite3.Connection) -> int:
+            balance = _insert_transaction_and_sum(conn, person_id, amount, description)
+            conn.commit()
+            return balance
+
+        async with self._connection() as conn:
+            balance = await asyncio.to_thread(_insert_and_sum, conn)
+        self._invalidate_history(person_id)
+        self._schedule_backup()
+        LOGGER.info(
+            "Added transaction for person_id=%s amount=%s description=%s",
+            person_id,
+            amount,
+            description,
+        )
+        return balance
+
+    async def add_transaction_for_person(
+        self, person_id: int, amount: int, description: str = ""
+    ) -> Optional[Tuple[Person, int]]:
+        """Record a transaction for ``person_id`` if that person exists.
+
+        Returns the person and their updated balance, or ``None`` without
+        writing anything when the ID is unknown. The lookup, insert and
+        balance query share one connection and one worker-thread hop.
+        """
+
+        def _lookup_insert_and_sum(
+            conn: sqlite3.Connection,
+        ) -> Optional[Tuple[Person, int]]:
+            row = conn.execute(
+                "SELECT id, name, created_at FROM people WHERE id = ?",
+                (person_id,),
+            ).fetchone()
+            if not row:
+                return None
+            balance = _insert_transaction_and_sum(conn, person_id, amount, description)
+            conn.commit()
+            person = Person(
+                id=row["id"],
+                name=row["name"],
+                created_at=datetime.fromisoformat(row["created_at"]),
+            )
+            return person, balance
+
+        async with self._connection() as conn:
+            result = await asyncio.to_thread(_lookup_insert_and_sum, conn)
+        if result is None:
+            return None
+        self._invalidate_history(person_id)
+        self._schedule_backup()
+        LOGGER.info(
+            "Added transaction for person_id=%s amount=%s description=%s",
+            person_id,
+            amount,
+            description,
+        )
+        return result
+
     async def list_person_descriptions(self, person_id: int) -> List[str]:
         """Return distinct non-empty descriptions used for a person."""
 
@@ -561,6 +725,7 @@ class Database:
                 (clean_new, person_id, old_description),
             )
             await asyncio.to_thread(conn.commit)
+        self._invalidate_history(person_id)
         self._schedule_backup()
         LOGGER.info(
             "Updated description for person_id=%s from %s to %s",
@@ -586,6 +751,7 @@ class Database:
                 (person_id, description),
             )
             await asyncio.to_thread(conn.commit)
+        self._invalidate_history(person_id)
         self._schedule_backup()
         LOGGER.info(
             "Cleared description for person_id=%s value=%s", person_id, description
@@ -624,12 +790,27 @@ class Database:
             row = await asyncio.to_thread(cursor.fetchone)
         return _to_int(row["balance"] if row and row["balance"] is not None else 0)
 
+    def _invalidate_history(self, person_id: int) -> None:
+        self._history_generations[person_id] = (
+            self._history_generations.get(person_id, 0) + 1
+        )
+
     async def get_history(
         self,
         person_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> List[Transaction]:
+        cache_key = (
+            person_id,
+            self._history_generations.get(person_id, 0),
+            start_date,
+            end_date,
+        )
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         query = [
             "SELECT id, person_id, amount, description, created_at",
             "FROM transactions",
@@ -650,7 +831,7 @@ class Database:
         async with self._connection() as conn:
             cursor = await asyncio.to_thread(conn.execute, sql, tuple(params))
             rows = await asyncio.to_thread(cursor.fetchall)
-        return [
+        history = [
             Transaction(
                 id=row["id"],
                 person_id=row["person_id"],
@@ -660,6 +841,8 @@ class Database:
             )
             for row in rows
         ]
+        self._history_cache[cache_key] = tuple(history)
+        return history
 
     async def get_transaction_timestamps(self, person_id: int) -> List[datetime]:
         async with self._connection() as conn:
@@ -698,7 +881,7 @@ class Database:
             await asyncio.gather(*tuple(self._background_tasks), return_exceptions=True)
 
     async def get_user_language(self, user_id: int) -> str:
-        async with self._connection() as conn:
+        async with self._read_connection() as conn:
             cursor = await asyncio.to_thread(
                 conn.execute,
                 "SELECT language FROM user_settings WHERE user_id = ?",
@@ -717,6 +900,7 @@ class Database:
                 (person_id,),
             )
             await asyncio.to_thread(conn.commit)
+        self._invalidate_history(person_id)
         LOGGER.info("Deleted person %s", person_id)
 
     async def total_debt(self) -> int:
@@ -861,14 +1045,10 @@ class Database:
             row = await asyncio.to_thread(cursor.fetchone)
         return _to_int(row[0] if row and row[0] is not None else 0)
 
-    async def export_transactions(
-        self,
-        *,
-        amount_filter: Optional[str] = None,
-        person_ids: Optional[Sequence[int]] = None,
-    ) -> Sequence[sqlite3.Row]:
-        """Return transactions ordered by date with optional filters."""
-
+    @staticmethod
+    def _export_query(
+        amount_filter: Optional[str], person_ids: Optional[Sequence[int]]
+    ) -> Tuple[str, Tuple[object, ...]]:
         conditions: list[str] = []
         params: list[object] = []
 
@@ -883,37 +1063,78 @@ class Database:
             params.extend(person_ids)
 
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = " ".join(
+            [
+                "SELECT",
+                "    t.id,",
+                "    t.person_id,",
+                "    p.name AS person_name,",
+                "    t.amount,",
+                "    t.description,",
+                "    t.created_at",
+                "FROM transactions t",
+                "JOIN people p ON p.id = t.person_id",
+                where_clause,
+                "ORDER BY t.created_at DESC, t.id DESC",
+            ]
+        )
+        return sql, tuple(params)
+
+    async def export_transactions(
+        self,
+        *,
+        amount_filter: Optional[str] = None,
+        person_ids: Optional[Sequence[int]] = None,
+    ) -> Sequence[sqlite3.Row]:
+        """Return transactions ordered by date with optional filters."""
 
+        sql, params = self._export_query(amount_filter, person_ids)
         async with self._connection() as conn:
-            cursor = await asyncio.to_thread(
-                conn.execute,
-                " ".join(
-                    [
-                        "SELECT",
-                        "    t.id,",
-                        "    t.person_id,",
-                        "    p.name AS person_name,",
-                        "    t.amount,",
-                        "    t.description,",
-                        "    t.created_at",
-                        "FROM transactions t",
-                        "JOIN people p ON p.id = t.person_id",
-                        where_clause,
-                        "ORDER BY t.created_at DESC, t.id DESC",
-                    ]
-                ),
-                tuple(params),
-            )
+            cursor = await asyncio.to_thread(conn.execute, sql, params)
             rows = await asyncio.to_thread(cursor.fetchall)
         return rows
 
+    async def iter_export_transactions(
+        self,
+        *,
+        amount_filter: Optional[str] = None,
+        person_ids: Optional[Sequence[int]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[List[sqlite3.Row]]:
+        """Yield the rows of :meth:`export_transactions` in batches.
+
+        Only one batch is held in memory at a time, and the read connection
+        does not block writers while a large export is being consumed.
+        """
+
+        sql, params = self._export_query(amount_filter, person_ids)
+        async with self._read_connection() as conn:
+            cursor = await asyncio.to_thread(conn.execute, sql, params)
+            while True:
+                batch = await asyncio.to_thread(cursor.fetchmany, batch_size)
+                if not batch:
+                    return
+                yield batch
+
     async def get_dashboard_summary(
         self, top: int = 3, recent: int = 5
     ) -> DashboardSummary:
         """Return aggregated information used for the dashboard view."""
 
-        async with self._connection() as conn:
-            totals_cursor = await asyncio.to_thread(
+        totals, top_debtors, recent_transactions = await asyncio.gather(
+            self._fetch_dashboard_totals(),
+            self._fetch_top_debtors(top),
+            self._fetch_recent_activity(recent),
+        )
+        return DashboardSummary(
+            totals=totals,
+            top_debtors=top_debtors,
+            recent_transactions=recent_transactions,
+        )
+
+    async def _fetch_dashboard_totals(self) -> DashboardTotals:
+        async with self._read_connection() as conn:
+            cursor = await asyncio.to_thread(
                 conn.execute,
                 """
                 SELECT
@@ -923,9 +1144,16 @@ class Database:
                 FROM transactions
                 """,
             )
-            totals_row = await asyncio.to_thread(totals_cursor.fetchone)
+            row = await asyncio.to_thread(cursor.fetchone)
+        return DashboardTotals(
+            total_debt=_to_int(row["total_debt"] if row else 0),
+            total_payments=_to_int(row["total_payments"] if row else 0),
+            outstanding_balance=_to_int(row["outstanding"] if row else 0),
+        )
 
-            debtors_cursor = await asyncio.to_thread(
+    async def _fetch_top_debtors(self, top: int) -> List[DebtorSummary]:
+        async with self._read_connection() as conn:
+            cursor = await asyncio.to_thread(
                 conn.execute,
                 """
                 SELECT
@@ -942,9 +1170,22 @@ class Database:
                 """,
                 (top,),
             )
-            debtor_rows = await asyncio.to_thread(debtors_cursor.fetchall)
+            rows = await asyncio.to_thread(cursor.fetchall)
+        return [
+            DebtorSummary(
+                person=Person(
+                    id=row["id"],
+                    name=row["name"],
+                    created_at=datetime.fromisoformat(row["created_at"]),
+                ),
+                balance=_to_int(row["balance"]),
+            )
+            for row in rows
+        ]
 
-            recent_cursor = await asyncio.to_thread(
+    async def _fetch_recent_activity(self, recent: int) -> List[RecentActivity]:
+        async with self._read_connection() as conn:
+            cursor = await asyncio.to_thread(
                 conn.execute,
                 """
                 SELECT
@@ -961,27 +1202,8 @@ class Database:
                 """,
                 (recent,),
             )
-            recent_rows = await asyncio.to_thread(recent_cursor.fetchall)
-
-        totals = DashboardTotals(
-            total_debt=_to_int(totals_row["total_debt"] if totals_row else 0),
-            total_payments=_to_int(totals_row["total_payments"] if totals_row else 0),
-            outstanding_balance=_to_int(totals_row["outstanding"] if totals_row else 0),
-        )
-
-        top_debtors = [
-            DebtorSummary(
-                person=Person(
-                    id=row["id"],
-                    name=row["name"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                ),
-                balance=_to_int(row["balance"]),
-            )
-            for row in debtor_rows
-        ]
-
-        recent_transactions = [
+            rows = await asyncio.to_thread(cursor.fetchall)
+        return [
             RecentActivity(
                 transaction=Transaction(
                     id=row["id"],
@@ -992,15 +1214,9 @@ class Database:
                 ),
                 person_name=row["person_name"],
             )
-            for row in recent_rows
+            for row in rows
         ]
 
-        return DashboardSummary(
-            totals=totals,
-            top_debtors=top_debtors,
-            recent_transactions=recent_transactions,
-        )
-
     async def create_backup_now(self) -> Path:
         """Create a fresh database backup immediately and return its path."""
 
@@ -1020,7 +1236,12 @@ class Database:
 
         with ZipFile(archive_path, "w", compression=ZIP_DEFLATED) as archive:
             if self.db_path.exists():
-                archive.write(self.db_path, arcname=self.db_path.name)
+                # Pooled connections keep the WAL open, so the main file alone
+                # may lack recent commits; archive a consistent snapshot.
+                with tempfile.TemporaryDirectory() as snapshot_dir:
+                    snapshot = Path(snapshot_dir) / self.db_path.name
+                    self._backup_database(snapshot)
+                    archive.write(snapshot, arcname=self.db_path.name)
 
             for path in sorted(backup_dir.iterdir()):
                 if path == archive_path or not path.is_file():
@@ -1,15 +1,22 @@
 """Keyboard helpers for AccountingBot."""
 from __future__ import annotations
 
-from itertools import islice
-from typing import Iterable, Sequence
+from functools import lru_cache
+from typing import Sequence
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from .database import PersonUsageStats, SearchResult
 from .localization import available_languages, get_text
 
+# Keyboards that depend only on the language (and a fixed flow name) are
+# immutable, so one instance per argument set is shared between updates.
+_LANGUAGE_CACHE_SIZE = len(available_languages()) * 2
+# Per-contact keyboards are cached too, bounded to the recently managed ones.
+_PERSON_KEYBOARD_CACHE_SIZE = 256
 
+
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def main_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     """Return the inline keyboard shown on the start screen."""
 
@@ -53,6 +60,7 @@ def main_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def back_to_main_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard with a single button to return to the main menu."""
 
@@ -61,6 +69,7 @@ def back_to_main_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def history_back_to_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard prompting the user to return to the main menu after history results."""
 
@@ -76,6 +85,7 @@ def history_back_to_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def cancel_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard with a single cancel button."""
 
@@ -84,6 +94,7 @@ def cancel_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=32)
 def skip_keyboard(language: str, flow: str) -> InlineKeyboardMarkup:
     """Inline keyboard allowing the user to skip optional steps."""
 
@@ -101,6 +112,7 @@ def skip_keyboard(language: str, flow: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def selection_method_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -121,6 +133,7 @@ def selection_method_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=32)
 def confirmation_keyboard(language: str, action: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -141,6 +154,7 @@ def confirmation_keyboard(language: str, action: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def management_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard for management options."""
 
@@ -179,6 +193,7 @@ def management_menu_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def contact_management_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard for contact management options."""
 
@@ -211,6 +226,7 @@ def contact_management_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def database_management_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard for database management options."""
 
@@ -237,6 +253,7 @@ def database_management_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def description_management_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard for description management options."""
 
@@ -300,6 +317,7 @@ def person_description_keyboard(
     return InlineKeyboardMarkup(buttons)
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def description_delete_confirmation_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard prompting the user to confirm description deletion."""
 
@@ -326,6 +344,7 @@ def description_delete_confirmation_keyboard(language: str) -> InlineKeyboardMar
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def description_edit_keyboard(language: str) -> InlineKeyboardMarkup:
     """Inline keyboard shown while editing a description."""
 
@@ -345,6 +364,7 @@ def description_edit_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def language_keyboard(language: str) -> InlineKeyboardMarkup:
     buttons = [
         [InlineKeyboardButton(label, callback_data=f"lang:{code}")]
@@ -356,8 +376,10 @@ def language_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(buttons)
 
 
-def search_results_keyboard(matches: Sequence[SearchResult]) -> InlineKeyboardMarkup:
-    """Inline keyboard listing the top person matches for quick selection."""
+def search_results_keyboard(
+    matches: Sequence[SearchResult], language: str
+) -> InlineKeyboardMarkup:
+    """Inline keyboard listing the top person matches followed by a cancel button."""
 
     buttons = [
         [
@@ -368,9 +390,36 @@ def search_results_keyboard(matches: Sequence[SearchResult]) -> InlineKeyboardMa
         ]
         for match in matches[:5]
     ]
+    buttons.append(_cancel_row(language))
     return InlineKeyboardMarkup(buttons)
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE * 2)
+def _person_menu_search_row(
+    language: str, search_active: bool
+) -> tuple[InlineKeyboardButton, ...]:
+    search_button = InlineKeyboardButton(
+        get_text("menu_search_button", language),
+        callback_data="person_search:start",
+    )
+    if not search_active:
+        return (search_button,)
+    return (
+        search_button,
+        InlineKeyboardButton(
+            get_text("clear_search", language),
+            callback_data="person_search:clear",
+        ),
+    )
+
+
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
+def _cancel_row(language: str) -> tuple[InlineKeyboardButton, ...]:
+    return (
+        InlineKeyboardButton(get_text("cancel", language), callback_data="workflow:cancel"),
+    )
+
+
 def person_menu_keyboard(
     people: Sequence[PersonUsageStats],
     language: str,
@@ -379,22 +428,10 @@ def person_menu_keyboard(
     *,
     search_active: bool,
 ) -> InlineKeyboardMarkup:
-    buttons: list[list[InlineKeyboardButton]] = []
-
-    search_row: list[InlineKeyboardButton] = [
-        InlineKeyboardButton(
-            get_text("menu_search_button", language),
-            callback_data="person_search:start",
-        )
+    # Buttons are immutable, so the fixed rows are shared between renders.
+    buttons: list[Sequence[InlineKeyboardButton]] = [
+        _person_menu_search_row(language, search_active)
     ]
-    if search_active:
-        search_row.append(
-            InlineKeyboardButton(
-                get_text("clear_search", language),
-                callback_data="person_search:clear",
-            )
-        )
-    buttons.append(search_row)
 
     buttons.extend(
         [
@@ -427,13 +464,12 @@ def person_menu_keyboard(
         if nav_buttons:
             buttons.append(nav_buttons)
 
-    buttons.append(
-        [InlineKeyboardButton(get_text("cancel", language), callback_data="workflow:cancel")]
-    )
+    buttons.append(_cancel_row(language))
 
     return InlineKeyboardMarkup(buttons)
 
 
+@lru_cache(maxsize=_PERSON_KEYBOARD_CACHE_SIZE)
 def manage_person_keyboard(person_id: int, language: str) -> InlineKeyboardMarkup:
     """Inline keyboard offering actions for a specific contact."""
 
@@ -449,15 +485,12 @@ def manage_person_keyboard(person_id: int, language: str) -> InlineKeyboardMarku
                     callback_data=f"person_manage:delete:{person_id}",
                 ),
             ],
-            [
-                InlineKeyboardButton(
-                    get_text("cancel", language), callback_data="workflow:cancel"
-                )
-            ],
+            _cancel_row(language),
         ]
     )
 
 
+@lru_cache(maxsize=_PERSON_KEYBOARD_CACHE_SIZE)
 def confirm_delete_person_keyboard(
     person_id: int, language: str
 ) -> InlineKeyboardMarkup:
@@ -473,15 +506,12 @@ def confirm_delete_person_keyboard(
                     callback_data=f"person_manage:back:{person_id}",
                 ),
             ],
-            [
-                InlineKeyboardButton(
-                    get_text("cancel", language), callback_data="workflow:cancel"
-                )
-            ],
+            _cancel_row(language),
         ]
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def history_range_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -520,35 +550,29 @@ def history_range_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
-def _chunked(iterable: Iterable[str], size: int) -> Iterable[list[str]]:
-    iterator = iter(iterable)
-    while True:
-        chunk = list(islice(iterator, size))
-        if not chunk:
-            return
-        yield chunk
+# Buttons per row in the custom history range pickers.
+_HISTORY_CUSTOM_ROW_SIZE = 3
 
 
 def _history_custom_keyboard(
     language: str,
     phase: str,
     level: str,
-    values: Iterable[str],
+    values: Sequence[str],
     label_fn,
 ) -> InlineKeyboardMarkup:
-    buttons: list[list[InlineKeyboardButton]] = []
-    for chunk in _chunked(values, 3):
-        row = [
-            InlineKeyboardButton(
-                label_fn(value),
-                callback_data=f"history:custom:{phase}:{level}:{value}",
-            )
-            for value in chunk
-        ]
-        buttons.append(row)
-    buttons.append(
-        [InlineKeyboardButton(get_text("cancel", language), callback_data="workflow:cancel")]
-    )
+    row_buttons = [
+        InlineKeyboardButton(
+            label_fn(value),
+            callback_data=f"history:custom:{phase}:{level}:{value}",
+        )
+        for value in values
+    ]
+    buttons: list[Sequence[InlineKeyboardButton]] = [
+        row_buttons[start : start + _HISTORY_CUSTOM_ROW_SIZE]
+        for start in range(0, len(row_buttons), _HISTORY_CUSTOM_ROW_SIZE)
+    ]
+    buttons.append(_cancel_row(language))
     return InlineKeyboardMarkup(buttons)
 
 
@@ -604,6 +628,7 @@ def history_custom_hour_keyboard(
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def history_confirmation_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -626,6 +651,7 @@ def history_confirmation_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def export_mode_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -654,6 +680,7 @@ def export_mode_keyboard(language: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)
 def export_contact_keyboard(language: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict
 
 
@@ -381,13 +382,26 @@ _LANGUAGES = {
 }
 
 
+@lru_cache(maxsize=4096)
 def get_text(key: str, language: str) -> str:
-    """Return the localized text for ``key`` and ``language``."""
+    """Return the localized text for ``key`` and ``language``.
+
+    Results are memoized per ``(key, language)``; callers format the returned
+    template themselves, so only static strings are ever cached.
+    """
 
     pack = _LANGUAGES.get(language, _LANGUAGES["en"])
     return pack.get(key)
 
 
+def preload_texts() -> None:
+    """Populate the :func:`get_text` cache for every known key and language."""
+
+    for code, pack in _LANGUAGES.items():
+        for key in pack.texts:
+            get_text(key, code)
+
+
 def available_languages() -> Dict[str, str]:
     """Return the list of available language codes and human-readable titles."""
 
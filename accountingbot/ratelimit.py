@@ -0,0 +1,177 @@
+"""Per-chat outbound rate limiting for Bot API requests."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, Dict, Hashable, List, Optional, Tuple, Union
+
+from telegram.ext import BaseRateLimiter
+
+from .cache import LRUCache
+
+_Result = Union[bool, Dict[str, Any], List[Dict[str, Any]]]
+
+# Endpoints whose identical, overlapping calls are almost always the result
+# of a double tap rather than an intentional repeat.
+_COALESCED_ENDPOINTS = frozenset({"sendMessage", "editMessageText"})
+
+# Endpoints that put text in front of the user count against the per-chat
+# budget. Markup edits, deletions, documents and chat actions only count
+# against the overall budget and the inner limiter.
+_CHAT_PACED_ENDPOINTS = frozenset({"sendMessage", "editMessageText"})
+
+
+class _OwnerCancelled(Exception):
+    """Set on a shared send when the caller that issued it was cancelled."""
+
+
+class TokenBucket:
+    """Token bucket that hands out send slots instead of blocking.
+
+    :meth:`reserve` always takes a token, letting the balance go negative, and
+    returns how long the caller has to wait before its slot comes up. Callers
+    on the same event loop therefore queue in arrival order without a lock.
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class ChatRateLimiter(BaseRateLimiter[Any]):
+    """Pace requests per chat and overall before they reach the Bot API.
+
+    Telegram throttles bots that send more than about one message per second
+    to a chat or thirty per second overall, answering with 429 errors that
+    each cost another round-trip. Requests are delayed up front instead; only
+    message sends and text edits are paced per chat. An
+    optional ``inner`` limiter, such as PTB's ``AIORateLimiter``, is applied
+    afterwards for group limits and retries.
+
+    When ``coalesce`` is enabled, an identical message send issued while the
+    first is still in flight shares that call and its result. Once a send
+    completes, a repeat goes out as a new message.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[BaseRateLimiter[Any]] = None,
+        *,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        overall_rate: float = 30.0,
+        overall_burst: float = 30.0,
+        max_chats: int = 10_000,
+        coalesce: bool = True,
+    ) -> None:
+        self._inner = inner
+        self._coalesce = coalesce
+        self._in_flight: Dict[Tuple[Hashable, ...], asyncio.Future[_Result]] = {}
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._overall = TokenBucket(overall_rate, overall_burst)
+        self._chats: LRUCache[Union[int, str], TokenBucket] = LRUCache(max_chats)
+
+    async def initialize(self) -> None:
+        if self._inner is not None:
+            await self._inner.initialize()
+
+    async def shutdown(self) -> None:
+        if self._inner is not None:
+            await self._inner.shutdown()
+
+    def _reserve(self, endpoint: str, chat_id: Optional[Union[int, str]]) -> float:
+        delay = self._overall.reserve()
+        if chat_id is None or endpoint not in _CHAT_PACED_ENDPOINTS:
+            return delay
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self._chat_rate, self._chat_burst)
+            self._chats[chat_id] = bucket
+        return max(delay, bucket.reserve())
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, _Result]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Any],
+    ) -> _Result:
+        if endpoint not in _COALESCED_ENDPOINTS or not self._coalesce:
+            return await self._send(
+                callback, args, kwargs, endpoint, data, rate_limit_args
+            )
+
+        key = (
+            endpoint,
+            data.get("chat_id"),
+            data.get("message_id"),
+            data.get("text"),
+            repr(data.get("reply_markup")),
+        )
+        pending = self._in_flight.get(key)
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _OwnerCancelled:
+                # The first waiter to wake re-issues the send; later ones
+                # join it.
+                pending = self._in_flight.get(key)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[_Result] = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._send(
+                callback, args, kwargs, endpoint, data, rate_limit_args
+            )
+        except BaseException as exc:
+            # Duplicates were not cancelled themselves, so they retry instead
+            # of inheriting this caller's cancellation.
+            future.set_exception(
+                _OwnerCancelled() if isinstance(exc, asyncio.CancelledError) else exc
+            )
+            # Mark as retrieved; duplicates, if any, handle it themselves.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(result)
+        return result
+
+    async def _send(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, _Result]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Any],
+    ) -> _Result:
+        delay = self._reserve(endpoint, data.get("chat_id"))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._inner is not None:
+            return await self._inner.process_request(
+                callback, args, kwargs, endpoint, data, rate_limit_args
+            )
+        return await callback(*args, **kwargs)
@@ -0,0 +1,84 @@
+"""Concurrent update processing that keeps each chat's updates in order."""
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+def _update_key(update: object) -> Optional[int]:
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+class ChatUpdateProcessor(BaseUpdateProcessor):
+    """Process updates from different chats concurrently, one chat at a time.
+
+    PTB's default processor handles a single update at a time, so one chat
+    waiting on the database or the Bot API holds up every other chat. Plain
+    ``concurrent_updates=True`` lifts that but also lets two updates from the
+    same chat race through a ``ConversationHandler``. Updates are serialized
+    per chat instead, falling back to the user for updates without a chat.
+
+    At most ``max_concurrent_updates`` handlers run at once. The limit is taken
+    only after the chat's lock is held: PTB's own semaphore is acquired before
+    :meth:`do_process_update`, so updates queued behind one busy chat would
+    otherwise hold every slot and stall all other chats. The base class is
+    therefore given a bound it never reaches.
+    """
+
+    __slots__ = ("_locks", "_waiters", "_limit", "_slots")
+
+    def __init__(self, max_concurrent_updates: int = 256) -> None:
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        super().__init__(sys.maxsize)
+        self._limit = max_concurrent_updates
+        self._slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._waiters: Dict[int, int] = {}
+
+    @property
+    def concurrency_limit(self) -> int:
+        """The maximum number of handlers that run at the same time."""
+
+        return self._limit
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        key = _update_key(update)
+        if key is None:
+            async with self._slots:
+                await coroutine
+            return
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock, self._slots:
+                await coroutine
+        finally:
+            remaining = self._waiters[key] - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                # Drop idle chats so the table only holds chats with work queued.
+                del self._waiters[key]
+                del self._locks[key]
@@ -0,0 +1,37 @@
+"""Tests for the in-process LRU cache."""
+import pytest
+
+from accountingbot import cache as cache_module
+from accountingbot.cache import LRUCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache: LRUCache[int, str] = LRUCache(maxsize=2)
+    cache[1] = "en"
+    cache[2] = "fa"
+    assert cache.get(1) == "en"
+
+    cache[3] = "en"
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "en"
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache: LRUCache[int, str] = LRUCache(maxsize=4, ttl=10)
+    cache[1] = "fa"
+
+    now[0] += 5
+    assert cache.get(1) == "fa"
+
+    now[0] += 10
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
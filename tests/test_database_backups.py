@@ -1,5 +1,7 @@
 import asyncio
 import os
+import sqlite3
+from zipfile import ZipFile
 from datetime import datetime, timedelta
 
 from accountingbot.database import Database, DatabaseBackupConfig
@@ -58,3 +60,29 @@ def test_compresses_and_prunes_old_backups(tmp_path):
         assert len(relevant_files) <= 2
 
     asyncio.run(runner())
+
+
+def test_zip_archive_contains_recent_commits(tmp_path):
+    async def runner() -> None:
+        db_path = tmp_path / "test.db"
+        backup_dir = tmp_path / "Database_Backups"
+        config = DatabaseBackupConfig(enabled=False, directory=str(backup_dir))
+
+        db = Database(db_path, backup_config=config)
+        await db.initialize()
+        person = await db.add_person("Alice")
+        await db.add_transaction(person.id, 10, "Lunch")
+
+        archive_path = await db.zip_all_databases()
+        await db.close()
+
+        extract_dir = tmp_path / "extracted"
+        with ZipFile(archive_path) as archive:
+            archive.extract(db_path.name, extract_dir)
+        with sqlite3.connect(extract_dir / db_path.name) as conn:
+            names = conn.execute("SELECT name FROM people").fetchall()
+            amounts = conn.execute("SELECT amount FROM transactions").fetchall()
+        assert names == [("Alice",)]
+        assert amounts == [(10,)]
+
+    asyncio.run(runner())
@@ -0,0 +1,118 @@
+import asyncio
+
+from accountingbot.database import Database, DatabaseBackupConfig
+
+
+def test_add_transaction_returning_balance(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        person = await db.add_person("Alice")
+
+        assert await db.add_transaction_returning_balance(person.id, 100, "Lunch") == 100
+        assert await db.add_transaction_returning_balance(person.id, -40) == 60
+        assert await db.get_balance(person.id) == 60
+
+        history = await db.get_history(person.id)
+        assert sorted(item.amount for item in history) == [-40, 100]
+
+    asyncio.run(runner())
+
+
+def test_add_transaction_for_person(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        person = await db.add_person("Alice")
+
+        recorded = await db.add_transaction_for_person(person.id, 100, "Lunch")
+        assert recorded is not None
+        assert recorded[0].name == "Alice"
+        assert recorded[1] == 100
+        assert await db.add_transaction_for_person(person.id + 1, 50) is None
+        assert len(await db.get_history(person.id)) == 1
+
+    asyncio.run(runner())
+
+
+def test_history_cache_is_invalidated_by_writes(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        person = await db.add_person("Alice")
+        await db.add_transaction(person.id, 100, "Lunch")
+
+        first = await db.get_history(person.id)
+        first.clear()
+        assert len(await db.get_history(person.id)) == 1
+
+        await db.add_transaction_returning_balance(person.id, -40)
+        assert len(await db.get_history(person.id)) == 2
+
+        await db.update_person_description(person.id, "Lunch", "Dinner")
+        history = await db.get_history(person.id)
+        assert {item.description for item in history} == {"Dinner", ""}
+
+    asyncio.run(runner())
+
+
+def test_dashboard_summary_aggregates(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        alice = await db.add_person("Alice")
+        bob = await db.add_person("Bob")
+        await db.add_transaction(alice.id, 100, "Lunch")
+        await db.add_transaction(alice.id, -30, "Cash")
+        await db.add_transaction(bob.id, 20, "Taxi")
+
+        summary = await db.get_dashboard_summary()
+
+        assert summary.totals.total_debt == 120
+        assert summary.totals.total_payments == -30
+        assert summary.totals.outstanding_balance == 90
+        assert [debtor.person.name for debtor in summary.top_debtors] == ["Alice", "Bob"]
+        assert len(summary.recent_transactions) == 3
+
+    asyncio.run(runner())
+
+
+def test_connections_are_pooled_and_reset(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+            pool_size=1,
+        )
+        await db.initialize()
+        person = await db.add_person("Alice")
+
+        async with db._connection() as conn:
+            first = conn
+            await asyncio.to_thread(
+                conn.execute,
+                "INSERT INTO transactions (person_id, amount) VALUES (?, ?)",
+                (person.id, 50),
+            )
+
+        async with db._read_connection() as conn:
+            assert conn is first
+            assert not conn.in_transaction
+        assert await db.get_balance(person.id) == 0
+
+        await db.close()
+        assert await db.get_balance(person.id) == 0
+
+    asyncio.run(runner())
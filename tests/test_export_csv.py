@@ -0,0 +1,71 @@
+"""Tests for the CSV export encoder."""
+import asyncio
+import csv
+from io import StringIO
+
+from accountingbot.bot import _CsvExportWriter
+from accountingbot.database import Database, DatabaseBackupConfig
+
+
+def _parse(document):
+    return list(csv.reader(StringIO(document.getvalue().decode("utf-8"))))
+
+
+def test_export_document_is_utf8_csv():
+    rows = [
+        {
+            "id": 1,
+            "person_name": "Alice, Jr.",
+            "person_id": 7,
+            "amount": 1500.0,
+            "description": "",
+            "created_at": "2024-01-02 03:04:05",
+        },
+        {
+            "id": 2,
+            "person_name": "Bob",
+            "person_id": 8,
+            "amount": -20,
+            "description": "Partial",
+            "created_at": "2024-01-03 00:00:00",
+        },
+    ]
+
+    export = _CsvExportWriter("en")
+    export.write_rows(rows[:1])
+    export.write_rows(rows[1:])
+    document = export.finish()
+
+    assert export.row_count == 2
+    assert document.tell() == 0
+    parsed = _parse(document)
+    assert len(parsed) == 3
+    assert parsed[1] == ["1", "Alice, Jr.", "7", parsed[1][3], "1,500$", "-", "2024-01-02 03:04:05"]
+    assert parsed[2][4] == "20$"
+    assert parsed[1][3] != parsed[2][3]
+
+
+def test_streamed_export_matches_bulk_export(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        person = await db.add_person("Alice")
+        for amount in (10, -5, 7, 3, -1):
+            await db.add_transaction(person.id, amount, "")
+
+        bulk = await db.export_transactions(amount_filter="debt")
+        batches = [
+            batch
+            async for batch in db.iter_export_transactions(
+                amount_filter="debt", batch_size=2
+            )
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        streamed = [row for batch in batches for row in batch]
+        assert [tuple(row) for row in streamed] == [tuple(row) for row in bulk]
+
+    asyncio.run(runner())
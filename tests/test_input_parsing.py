@@ -0,0 +1,40 @@
+"""Tests for parsing user-provided amounts, references and date ranges."""
+from datetime import datetime
+
+from accountingbot.bot import (
+    _parse_callback_id,
+    _parse_date_range,
+    _parse_person_reference,
+    _parse_positive_amount,
+)
+
+
+def test_parse_positive_amount():
+    assert _parse_positive_amount(" 1500 ") == 1500
+    assert _parse_positive_amount("۱۲۳") == 123
+    for invalid in ("", "0", "-5", "12.5", "1,000", "abc", "12 34"):
+        assert _parse_positive_amount(invalid) is None, invalid
+
+
+def test_parse_date_range():
+    assert _parse_date_range("2024-01-01, 2024-01-31 18:00") == (
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 31, 18, 0),
+    )
+    for invalid in ("2024-01-01", "2024-01-01,", "yesterday, today", ""):
+        assert _parse_date_range(invalid) is None, invalid
+
+
+def test_parse_person_reference():
+    assert _parse_person_reference("#42") == 42
+    assert _parse_person_reference(" 7 ") == 7
+    assert _parse_person_reference("۱۲") == 12
+    for invalid in ("", "#", "##3", "4a", "Alice", "-1", "²"):
+        assert _parse_person_reference(invalid) is None, invalid
+
+
+def test_parse_callback_id():
+    assert _parse_callback_id("select_person:15") == 15
+    assert _parse_callback_id("person_page:3") == 3
+    for invalid in ("select_person:", "select_person:x", "select_person", "a:1:2"):
+        assert _parse_callback_id(invalid) is None, invalid
@@ -0,0 +1,12 @@
+"""Tests for localization helpers."""
+from accountingbot.localization import get_text, preload_texts
+
+
+def test_preload_texts_warms_get_text():
+    get_text.cache_clear()
+    preload_texts()
+    hits_before = get_text.cache_info().hits
+
+    get_text("search_filters_hint", "fa")
+
+    assert get_text.cache_info().hits == hits_before + 1
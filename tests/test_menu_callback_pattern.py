@@ -1,5 +1,9 @@
-"""Tests for the menu callback fallback pattern."""
-from accountingbot.bot import MAIN_MENU_ACTIONS, MENU_CALLBACK_FALLBACK_PATTERN
+"""Tests for the menu callback patterns."""
+from accountingbot.bot import (
+    CALLBACK_ROUTE_PATTERN,
+    MAIN_MENU_ACTIONS,
+    MENU_CALLBACK_FALLBACK_PATTERN,
+)
 
 
 def test_menu_fallback_pattern_ignores_known_actions():
@@ -13,3 +17,21 @@ def test_menu_fallback_pattern_matches_unknown_actions():
     unknown_actions = ["menu:unknown", "menu:new_feature", "menu:123"]
     for callback_data in unknown_actions:
         assert MENU_CALLBACK_FALLBACK_PATTERN.match(callback_data)
+
+
+def test_callback_route_pattern_leaves_conversation_entries_alone():
+    for callback_data in (
+        "menu:dashboard",
+        "menu:back_to_main",
+        "management:contacts",
+        "management:contacts:list",
+    ):
+        assert CALLBACK_ROUTE_PATTERN.match(callback_data), callback_data
+    for callback_data in (
+        "menu:add_debt",
+        "menu:history",
+        "menu:dashboard:x",
+        "management:contacts:edit",
+        "management",
+    ):
+        assert CALLBACK_ROUTE_PATTERN.match(callback_data) is None, callback_data
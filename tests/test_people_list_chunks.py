@@ -0,0 +1,33 @@
+"""Tests for splitting long contact lists into Telegram-sized messages."""
+from accountingbot.bot import _chunk_lines
+
+
+def _reference_chunks(lines, max_length):
+    chunks = []
+    chunk = ""
+    for line in lines:
+        candidate = f"{chunk}\n{line}" if chunk else line
+        if len(candidate) > max_length and chunk:
+            chunks.append(chunk)
+            chunk = line
+        else:
+            chunk = candidate
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def test_chunks_respect_limit_and_preserve_order():
+    lines = ["header"] + [f"• Person {index} (#{index})" for index in range(500)]
+
+    chunks = _chunk_lines(lines, 200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "\n".join(chunks).split("\n") == lines
+    assert chunks == _reference_chunks(lines, 200)
+
+
+def test_oversized_line_gets_its_own_chunk():
+    lines = ["short", "x" * 50, "tail"]
+
+    assert _chunk_lines(lines, 10) == ["short", "x" * 50, "tail"]
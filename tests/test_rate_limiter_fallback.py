@@ -5,6 +5,8 @@ import logging
 
 
 from accountingbot import bot
+from accountingbot.config import BotConfig
+from accountingbot.ratelimit import ChatRateLimiter
 
 
 class _DummyBuilder:
@@ -12,18 +14,44 @@ class _DummyBuilder:
 
     def __init__(self):
         self.token_value = None
-        self.rate_limiter_called = False
+        self.limiter = None
+        self.update_processor = None
+        self.settings = {}
 
     def token(self, value):  # pragma: no cover - simple pass-through
         self.token_value = value
         return self
 
+    def connection_pool_size(self, value):  # pragma: no cover - simple pass-through
+        self.settings["connection_pool_size"] = value
+        return self
+
+    def pool_timeout(self, value):  # pragma: no cover - simple pass-through
+        self.settings["pool_timeout"] = value
+        return self
+
+    def connect_timeout(self, value):  # pragma: no cover - simple pass-through
+        self.settings["connect_timeout"] = value
+        return self
+
+    def read_timeout(self, value):  # pragma: no cover - simple pass-through
+        self.settings["read_timeout"] = value
+        return self
+
+    def get_updates_pool_timeout(self, value):  # pragma: no cover - simple pass-through
+        self.settings["get_updates_pool_timeout"] = value
+        return self
+
     def rate_limiter(self, limiter):  # pragma: no cover - simple pass-through
-        self.rate_limiter_called = True
+        self.limiter = limiter
+        return self
+
+    def concurrent_updates(self, processor):  # pragma: no cover - simple pass-through
+        self.update_processor = processor
         return self
 
     def build(self):  # pragma: no cover - simple pass-through
-        return SimpleNamespace(token=self.token_value, limited=self.rate_limiter_called)
+        return SimpleNamespace(token=self.token_value, rate_limiter=self.limiter)
 
 
 def test_build_application_without_rate_limiter(monkeypatch, caplog):
@@ -42,16 +70,23 @@ def test_build_application_without_rate_limiter(monkeypatch, caplog):
 
     monkeypatch.setattr(bot, "ApplicationBuilder", fake_builder)
     monkeypatch.setattr(bot, "AIORateLimiter", FailingRateLimiter)
+    limiter, error = bot._probe_rate_limiter()
+    assert limiter is None
+    monkeypatch.setattr(bot, "_RATE_LIMITER", limiter)
+    monkeypatch.setattr(bot, "_RATE_LIMITER_ERROR", error)
 
     caplog.set_level(logging.WARNING)
 
-    config = SimpleNamespace(token="dummy-token")
+    config = BotConfig(token="dummy-token", connection_pool_size=64)
     application = bot.build_application(config)
 
     assert builder_instances, "Expected ApplicationBuilder to be instantiated"
     builder = builder_instances[0]
     assert builder.token_value == "dummy-token"
-    assert builder.rate_limiter_called is False
     assert application.token == "dummy-token"
-    assert application.limited is False
-    assert any("Rate limiter disabled" in message for message in caplog.messages)
+    # Per-chat pacing does not depend on the optional extras.
+    assert isinstance(application.rate_limiter, ChatRateLimiter)
+    assert application.rate_limiter._inner is None
+    assert builder.settings["connection_pool_size"] == 64
+    assert builder.update_processor.concurrency_limit == 64
+    assert any("rate limiting" in message for message in caplog.messages)
@@ -0,0 +1,144 @@
+"""Tests for the per-chat outbound rate limiter."""
+import asyncio
+
+from accountingbot.ratelimit import ChatRateLimiter, TokenBucket
+
+
+def test_token_bucket_reserves_future_slots():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.9 < bucket.reserve() <= 1.0
+    assert 1.9 < bucket.reserve() <= 2.0
+
+
+def test_chat_rate_limiter_paces_each_chat_separately(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    async def send(text):
+        return {"text": text}
+
+    async def runner() -> None:
+        limiter = ChatRateLimiter(chat_rate=1.0, chat_burst=1, coalesce=False)
+        await limiter.initialize()
+        for chat_id in (1, 2, 1):
+            result = await limiter.process_request(
+                send, ("hi",), {}, "sendMessage", {"chat_id": chat_id}, None
+            )
+            assert result == {"text": "hi"}
+        await limiter.shutdown()
+
+    asyncio.run(runner())
+
+    assert len(delays) == 1
+    assert 0.9 < delays[0] <= 1.0
+
+
+def test_chat_rate_limiter_only_paces_messages_per_chat(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    async def call():
+        return True
+
+    async def runner() -> None:
+        limiter = ChatRateLimiter(chat_rate=1.0, chat_burst=1, coalesce=False)
+        for endpoint in (
+            "sendMessage",
+            "editMessageReplyMarkup",
+            "deleteMessage",
+            "sendChatAction",
+            "sendDocument",
+        ):
+            await limiter.process_request(call, (), {}, endpoint, {"chat_id": 1}, None)
+
+    asyncio.run(runner())
+
+    assert delays == []
+
+
+def test_chat_rate_limiter_coalesces_duplicate_sends():
+    calls = []
+
+    async def send(text):
+        calls.append(text)
+        await asyncio.sleep(0)
+        return {"text": text}
+
+    async def runner() -> None:
+        limiter = ChatRateLimiter()
+        data = {"chat_id": 1, "text": "hi"}
+        first, second = await asyncio.gather(
+            limiter.process_request(send, ("hi",), {}, "sendMessage", data, None),
+            limiter.process_request(send, ("hi",), {}, "sendMessage", dict(data), None),
+        )
+        assert first == second == {"text": "hi"}
+        await limiter.process_request(
+            send, ("other",), {}, "sendMessage", {"chat_id": 1, "text": "other"}, None
+        )
+
+    asyncio.run(runner())
+
+    assert calls == ["hi", "other"]
+
+
+def test_chat_rate_limiter_resends_after_completion():
+    calls = []
+
+    async def send(text):
+        calls.append(text)
+        return {"text": text}
+
+    async def runner() -> None:
+        limiter = ChatRateLimiter()
+        data = {"chat_id": 1, "text": "Invalid amount"}
+        for _ in range(2):
+            await limiter.process_request(
+                send, ("Invalid amount",), {}, "sendMessage", dict(data), None
+            )
+        assert not limiter._in_flight
+
+    asyncio.run(runner())
+
+    assert calls == ["Invalid amount", "Invalid amount"]
+
+
+def test_duplicate_send_survives_cancelled_owner():
+    calls = []
+
+    async def send(text):
+        calls.append(text)
+        if len(calls) == 1:
+            # The owner's call hangs until its task is cancelled.
+            await asyncio.Event().wait()
+        return {"text": text}
+
+    async def runner() -> None:
+        limiter = ChatRateLimiter()
+        data = {"chat_id": 1, "text": "hi"}
+        owner = asyncio.create_task(
+            limiter.process_request(send, ("hi",), {}, "sendMessage", data, None)
+        )
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(
+            limiter.process_request(send, ("hi",), {}, "sendMessage", dict(data), None)
+        )
+        await asyncio.sleep(0)
+        owner.cancel()
+        assert await duplicate == {"text": "hi"}
+        assert owner.cancelled()
+        assert not limiter._in_flight
+
+    asyncio.run(runner())
+
+    assert calls == ["hi", "hi"]
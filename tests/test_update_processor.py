@@ -0,0 +1,96 @@
+"""Tests for the per-chat update processor."""
+import asyncio
+
+from telegram import Chat, Update
+
+from accountingbot.updates import ChatUpdateProcessor
+
+
+def _message_update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": chat_id, "type": Chat.PRIVATE},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "A"},
+                "text": "hi",
+            },
+        },
+        None,
+    )
+
+
+def test_updates_run_concurrently_across_chats_and_in_order_per_chat():
+    events = []
+
+    async def handle(name: str, release: asyncio.Event) -> None:
+        events.append(f"start {name}")
+        await release.wait()
+        events.append(f"end {name}")
+
+    async def runner() -> None:
+        processor = ChatUpdateProcessor()
+        first, second, other = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        tasks = [
+            asyncio.create_task(
+                processor.process_update(_message_update(1, 10), handle("a1", first))
+            ),
+            asyncio.create_task(
+                processor.process_update(_message_update(2, 10), handle("a2", second))
+            ),
+            asyncio.create_task(
+                processor.process_update(_message_update(3, 20), handle("b", other))
+            ),
+        ]
+        await asyncio.sleep(0)
+        assert events == ["start a1", "start b"]
+        other.set()
+        second.set()
+        await asyncio.sleep(0)
+        assert "start a2" not in events
+        first.set()
+        await asyncio.gather(*tasks)
+        assert not processor._locks and not processor._waiters
+
+    asyncio.run(runner())
+
+    assert events.index("end a1") < events.index("start a2")
+
+
+def test_queued_updates_of_a_busy_chat_do_not_block_other_chats():
+    started = []
+
+    async def handle(name: str, release: asyncio.Event) -> None:
+        started.append(name)
+        await release.wait()
+
+    async def runner() -> None:
+        processor = ChatUpdateProcessor(max_concurrent_updates=2)
+        release = asyncio.Event()
+        updates = [
+            ("a1", 10),
+            ("a2", 10),
+            ("a3", 10),
+            ("b", 20),
+            ("c", 30),
+        ]
+        tasks = [
+            asyncio.create_task(
+                processor.process_update(
+                    _message_update(update_id, chat_id), handle(name, release)
+                )
+            )
+            for update_id, (name, chat_id) in enumerate(updates, start=1)
+        ]
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Chat 10's queued updates wait for its lock without taking a slot,
+        # while the two slots still cap how many handlers run.
+        assert started == ["a1", "b"]
+        release.set()
+        await asyncio.gather(*tasks)
+        assert sorted(started) == ["a1", "a2", "a3", "b", "c"]
+
+    asyncio.run(runner())
@@ -8,9 +8,11 @@ from telegram.ext import ConversationHandler
 from accountingbot.bot import (
     ADD_PERSON_NAME,
     LANGUAGE_SELECTION,
+    TEXT_MESSAGE_FILTER,
     cancel,
     change_language,
     register_handlers,
+    start_language,
 )
 
 
@@ -91,3 +93,35 @@ def test_language_option_callback_reaches_handler() -> None:
     assert state == LANGUAGE_SELECTION
     assert key == (chat_id, user_id)
     assert handler.callback is change_language
+
+
+def test_language_entry_accepts_both_menu_callbacks() -> None:
+    app = FakeApplication()
+    register_handlers(app)
+
+    conv = _find_conversation(app, "language")
+    for data in ("menu:language", "management:language"):
+        result = conv.check_update(_make_callback_update(data, 5, 6))
+        assert result is not None, data
+        assert result[2].callback is start_language
+
+
+def _make_text_update(field: str, text: str) -> Update:
+    payload = {
+        "update_id": 2,
+        field: {
+            "message_id": 5,
+            "date": int(datetime.now(tz=timezone.utc).timestamp()),
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": text,
+        },
+    }
+    return Update.de_json(payload, DummyBot())
+
+
+def test_text_filter_ignores_edited_messages() -> None:
+    assert TEXT_MESSAGE_FILTER.check_update(_make_text_update("message", "42"))
+    assert not TEXT_MESSAGE_FILTER.check_update(
+        _make_text_update("edited_message", "42")
+    )
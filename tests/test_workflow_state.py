@@ -0,0 +1,129 @@
+"""Tests for the workflow state kept in ``user_data``."""
+import asyncio
+from types import SimpleNamespace
+
+from telegram.ext import ConversationHandler
+
+from accountingbot import bot
+from accountingbot.bot import (
+    DB_KEY,
+    _begin_workflow,
+    _has_active_workflow,
+    clear_workflow,
+    handle_person_menu_navigation,
+    receive_debt_description,
+    receive_payment_description,
+)
+from accountingbot.database import Database, DatabaseBackupConfig
+from accountingbot.localization import get_text
+
+
+def test_begin_workflow_marks_user_active():
+    context = SimpleNamespace(user_data={})
+    assert not _has_active_workflow(context)
+
+    _begin_workflow(context, "debt")
+
+    assert context.user_data["flow"] == "debt"
+    assert _has_active_workflow(context)
+
+
+def test_clear_workflow_resets_active_flag():
+    context = SimpleNamespace(user_data={})
+    _begin_workflow(context)
+
+    clear_workflow(context)
+
+    assert not _has_active_workflow(context)
+
+
+def test_clear_workflow_keeps_unrelated_user_data():
+    context = SimpleNamespace(
+        user_data={"language": "fa", "amount": 5, "person_menu_page": 2}
+    )
+    _begin_workflow(context, "payment")
+
+    clear_workflow(context)
+
+    assert context.user_data == {"language": "fa"}
+
+
+
+class _FakeMessage:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def test_menu_entries_for_a_deleted_contact_end_the_workflow(tmp_path):
+    async def runner() -> None:
+        db = Database(
+            tmp_path / "test.db",
+            backup_config=DatabaseBackupConfig(enabled=False),
+        )
+        await db.initialize()
+        for complete in (receive_debt_description, receive_payment_description):
+            person = await db.add_person("Alice")
+            context = SimpleNamespace(
+                user_data={"language": "en"}, bot_data={DB_KEY: db}
+            )
+            _begin_workflow(context, "debt")
+            context.user_data.update(person=person, amount=10)
+            # The contact disappears after it was picked from the menu.
+            await db.delete_person(person.id)
+
+            message = _FakeMessage("Lunch")
+            update = SimpleNamespace(
+                message=message,
+                callback_query=None,
+                effective_user=SimpleNamespace(id=1),
+            )
+            assert await complete(update, context) == ConversationHandler.END
+
+            assert message.replies[0].startswith(get_text("not_found", "en"))
+            assert not _has_active_workflow(context)
+            assert await db.get_history(person.id) == []
+        await db.close()
+
+    asyncio.run(runner())
+
+
+def test_person_menu_navigation_only_skips_the_current_menu_message(monkeypatch):
+    rendered = []
+
+    async def fake_show_person_menu(update, context, language, page=0, **kwargs):
+        rendered.append((update.callback_query.message.message_id, page))
+        return None
+
+    async def answer():
+        return True
+
+    monkeypatch.setattr(bot, "show_person_menu", fake_show_person_menu)
+
+    def tap(message_id):
+        return SimpleNamespace(
+            callback_query=SimpleNamespace(
+                data="person_page:1",
+                answer=answer,
+                message=SimpleNamespace(message_id=message_id),
+            ),
+            effective_user=SimpleNamespace(id=1),
+        )
+
+    async def runner() -> None:
+        context = SimpleNamespace(
+            user_data={
+                "language": "en",
+                "person_menu_page": 1,
+                "person_menu_message_id": 20,
+            }
+        )
+        await handle_person_menu_navigation(tap(20), context)
+        await handle_person_menu_navigation(tap(10), context)
+
+    asyncio.run(runner())
+
+    assert rendered == [(10, 1)]